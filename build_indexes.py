@@ -83,9 +83,8 @@ def test_patient_queries(index: FAISSIndex):
         "diabetes well controlled",
     ]
 
-    for query in queries:
+    for query, results in zip(queries, index.query_many(queries, top_k=2)):
         print(f"\n--- Query: '{query}' ---")
-        results = index.query(query, top_k=2)
         for i, result in enumerate(results, 1):
             print(f"\n  Result {i} (score: {result['score']:.3f}):")
             print(f"    ID: {result['id']}")
@@ -108,9 +107,8 @@ def test_guideline_queries(index: FAISSIndex):
         "statin therapy recommendations",
     ]
 
-    for query in queries:
+    for query, results in zip(queries, index.query_many(queries, top_k=2)):
         print(f"\n--- Query: '{query}' ---")
-        results = index.query(query, top_k=2)
         for i, result in enumerate(results, 1):
             print(f"\n  Result {i} (score: {result['score']:.3f}):")
             print(f"    ID: {result['id']}")
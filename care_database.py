@@ -3,7 +3,7 @@
 import sqlite3
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List
 import json
 import uuid
 
@@ -92,6 +92,12 @@ class CareDatabase:
             )
         """)
 
+        # Earliest-available-slot lookups filter on availability, sort by time
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_doctor_slots_available
+            ON doctor_slots (is_available, slot_datetime)
+        """)
+
         # Audit logs table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS audit_logs (
@@ -218,6 +224,36 @@ class CareDatabase:
         row = cursor.fetchone()
         return dict(row) if row else None
 
+    def get_latest_notes(self, patient_ids: List[str]) -> Dict[str, Optional[dict]]:
+        """Get the most recent note for several patients in one query.
+
+        Args:
+            patient_ids: Patient identifiers
+
+        Returns:
+            Dict mapping each patient ID to its most recent note, or None
+        """
+        patient_ids = list(patient_ids)
+        notes: Dict[str, Optional[dict]] = dict.fromkeys(patient_ids)
+        if not patient_ids:
+            return notes
+
+        placeholders = ", ".join("?" * len(patient_ids))
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT id, patient_id, note_date, note_text, created_at FROM (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY patient_id ORDER BY note_date DESC
+                ) AS rank
+                FROM patient_notes
+                WHERE patient_id IN ({placeholders})
+            )
+            WHERE rank = 1
+        """, patient_ids)
+        for row in cursor.fetchall():
+            notes[row["patient_id"]] = dict(row)
+        return notes
+
     # ==================== Doctor Methods ====================
 
     def add_doctor(self, doctor_id: str, name: str, specialty: str) -> str:
@@ -316,6 +352,41 @@ class CareDatabase:
             """)
         return [dict(row) for row in cursor.fetchall()]
 
+    def get_earliest_available_slot(
+        self,
+        doctor_ids: List[str],
+        preferred_date: Optional[str] = None
+    ) -> Optional[dict]:
+        """Get the earliest available slot among several doctors in one query.
+
+        Args:
+            doctor_ids: Doctors whose slots to consider (e.g. everyone in
+                a specialty)
+            preferred_date: Optional date prefix to restrict slots to
+                (e.g., "YYYY-MM-DD")
+
+        Returns:
+            Slot record with doctor_name and specialty, or None
+        """
+        doctor_ids = list(doctor_ids)
+        if not doctor_ids:
+            return None
+
+        placeholders = ", ".join("?" * len(doctor_ids))
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT ds.*, d.name as doctor_name, d.specialty
+            FROM doctor_slots ds
+            JOIN doctors d ON ds.doctor_id = d.doctor_id
+            WHERE ds.doctor_id IN ({placeholders})
+              AND ds.is_available = 1
+              AND (? IS NULL OR ds.slot_datetime LIKE ? || '%')
+            ORDER BY ds.slot_datetime
+            LIMIT 1
+        """, (*doctor_ids, preferred_date, preferred_date))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
     # ==================== Appointment Methods ====================
 
     def create_appointment(self, patient_id: str, doctor_id: str,
@@ -17,7 +17,7 @@ from dotenv import load_dotenv
 from planner_agent import PlannerAgent, ExecutionPlan, ActionType
 from extraction import PatientFactExtractor, ExtractedFacts
 from reasoning_engine import ReasoningEngine, ReasoningResult, GapResult
-from tools import BookingTool, VectorSearchTool, BookingResult
+from tools import BookingTool, BookingResult, get_vector_search_tool
 from chaos_mode import get_chaos_config, check_faiss_chaos, check_pinecone_chaos, ChaosError, FALLBACK_RESPONSE
 
 load_dotenv()
@@ -93,7 +93,7 @@ class CareOrchestrator:
         self.extractor = PatientFactExtractor()
         self.reasoning_engine = ReasoningEngine()
         self.booking_tool = BookingTool(db)
-        self.vector_search = VectorSearchTool()
+        self.vector_search = get_vector_search_tool()
 
         # Initialize OpenAI client for response generation
         api_key = os.getenv("OPENAI_API_KEY")
@@ -14,8 +14,11 @@ CRITICAL PRIVACY RULES:
 This is a core component of the PHI-Aware Data Residency architecture.
 """
 
-from dataclasses import dataclass
-from typing import Optional
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 
 # Mapping from diagnoses to generic clinical concepts
@@ -88,17 +91,25 @@ GAP_TYPE_CONCEPTS = {
 }
 
 
-@dataclass
+@dataclass(frozen=True)
 class ConceptQuery:
-    """Result of concept extraction - safe for external queries."""
+    """Result of concept extraction - safe for external queries.
+
+    Immutable (including source_conditions, a read-only mapping) so that
+    ConceptQueryBuilder can hand out cached instances.
+    """
 
     query_text: str
-    concepts: list[str]
-    source_conditions: list[str]  # Which conditions triggered this (for logging)
+    concepts: tuple[str, ...]
+    # Which conditions triggered this (for logging), keyed by kind:
+    # {"diagnosis": (...), "metric": (...), "missing_med": (...), "gap": (...)}
+    source_conditions: Mapping[str, tuple[str, ...]]
     is_phi_safe: bool  # Always True if properly constructed
+    text_lower: str = field(init=False, repr=False)  # Cached lowercase query_text
 
     def __post_init__(self):
-        """Validate PHI safety after construction."""
+        """Cache the lowercased query text and validate PHI safety."""
+        object.__setattr__(self, "text_lower", self.query_text.lower())
         self._validate_phi_safety()
 
     def _validate_phi_safety(self):
@@ -117,7 +128,116 @@ class ConceptQuery:
 
         # Note: In production, this would be more rigorous
         # For this implementation, we trust the extraction process
-        self.is_phi_safe = True
+        object.__setattr__(self, "is_phi_safe", True)
+
+
+def _extract_safe_terms(text: str) -> list[str]:
+    """
+    Extract safe clinical terms from text, removing any potential PHI.
+
+    Args:
+        text: Input text that might contain PHI
+
+    Returns:
+        List of safe clinical terms
+    """
+    safe_terms = []
+
+    # Split into words
+    words = text.replace(',', ' ').replace('.', ' ').split()
+
+    for word in words:
+        # Skip numbers (could be patient values)
+        if any(char.isdigit() for char in word):
+            continue
+
+        # Skip very short words
+        if len(word) < 3:
+            continue
+
+        # Skip words that look like identifiers
+        if word.upper() == word and len(word) > 2:
+            continue
+
+        # Keep clinical-looking terms
+        safe_terms.append(word.lower())
+
+    return safe_terms
+
+
+@lru_cache(maxsize=256)
+def _build_concept_query(
+    diagnoses: tuple[str, ...],
+    has_a1c: bool,
+    has_blood_pressure: bool,
+    missing_med_classes: tuple[str, ...],
+    gap_types: tuple[str, ...],
+) -> ConceptQuery:
+    """Build the concept query; memoized on the hashable inputs.
+
+    Many patients share the same diagnosis profile, so repeated inputs
+    return the cached (immutable) ConceptQuery. Module-level so the cache
+    holds no builder instances; the concept tables it reads are constants.
+    """
+    concepts = set()
+    source_conditions: dict[str, list[str]] = {}
+
+    # Extract concepts from diagnoses
+    if diagnoses:
+        for diagnosis in diagnoses:
+            normalized = diagnosis.lower().strip()
+            source_conditions.setdefault("diagnosis", []).append(normalized)
+
+            # Look up concepts for this diagnosis
+            for key, concept_list in DIAGNOSIS_CONCEPTS.items():
+                if key in normalized or normalized in key:
+                    concepts.update(concept_list)
+                    break
+            else:
+                # Unknown diagnosis - add generic form
+                # Remove any potential PHI (numbers, dates)
+                safe_terms = _extract_safe_terms(normalized)
+                concepts.update(safe_terms)
+
+    # Add metric concepts (NOT the values)
+    if has_a1c:
+        concepts.update(METRIC_CONCEPTS["a1c"])
+        source_conditions.setdefault("metric", []).append("a1c_present")
+
+    if has_blood_pressure:
+        concepts.update(METRIC_CONCEPTS["blood_pressure"])
+        source_conditions.setdefault("metric", []).append("bp_present")
+
+    # Extract concepts from medication classes needed
+    if missing_med_classes:
+        for med_class in missing_med_classes:
+            normalized = med_class.lower().strip()
+            source_conditions.setdefault("missing_med", []).append(normalized)
+
+            if normalized in MEDICATION_CLASS_CONCEPTS:
+                concepts.update(MEDICATION_CLASS_CONCEPTS[normalized])
+
+    # Add concepts from detected gap types
+    if gap_types:
+        for gap_type in gap_types:
+            source_conditions.setdefault("gap", []).append(gap_type)
+
+            if gap_type in GAP_TYPE_CONCEPTS:
+                concepts.update(GAP_TYPE_CONCEPTS[gap_type])
+
+    # Build final query string
+    # Remove duplicates and sort for consistency
+    concept_list = sorted(list(concepts))
+    query_text = " ".join(concept_list) + " guidelines clinical recommendations"
+
+    return ConceptQuery(
+        query_text=query_text,
+        concepts=tuple(concept_list),
+        source_conditions=MappingProxyType({
+            kind: tuple(values) for kind, values in source_conditions.items()
+        }),
+        is_phi_safe=True,
+    )
 
 
 class ConceptQueryBuilder:
@@ -137,13 +257,11 @@ class ConceptQueryBuilder:
     - Specific numeric values (8.2, 142/90, etc.)
     - Dates or timestamps
     - Raw clinical note text
-    """
 
-    def __init__(self):
-        self.diagnosis_concepts = DIAGNOSIS_CONCEPTS
-        self.medication_concepts = MEDICATION_CLASS_CONCEPTS
-        self.metric_concepts = METRIC_CONCEPTS
-        self.gap_concepts = GAP_TYPE_CONCEPTS
+    The concept tables (DIAGNOSIS_CONCEPTS, MEDICATION_CLASS_CONCEPTS,
+    METRIC_CONCEPTS, GAP_TYPE_CONCEPTS) are module-global rather than
+    per-instance, because build_query results are cached across builders.
+    """
 
     def build_query(
         self,
@@ -166,64 +284,15 @@ class ConceptQueryBuilder:
             gap_types: Types of care gaps detected
 
         Returns:
-            ConceptQuery with de-identified query text
+            ConceptQuery with de-identified query text (shared between
+            calls with identical inputs - do not mutate)
         """
-        concepts = set()
-        source_conditions = []
-
-        # Extract concepts from diagnoses
-        if diagnoses:
-            for diagnosis in diagnoses:
-                normalized = diagnosis.lower().strip()
-                source_conditions.append(f"diagnosis:{normalized}")
-
-                # Look up concepts for this diagnosis
-                for key, concept_list in self.diagnosis_concepts.items():
-                    if key in normalized or normalized in key:
-                        concepts.update(concept_list)
-                        break
-                else:
-                    # Unknown diagnosis - add generic form
-                    # Remove any potential PHI (numbers, dates)
-                    safe_terms = self._extract_safe_terms(normalized)
-                    concepts.update(safe_terms)
-
-        # Add metric concepts (NOT the values)
-        if has_a1c:
-            concepts.update(self.metric_concepts["a1c"])
-            source_conditions.append("metric:a1c_present")
-
-        if has_blood_pressure:
-            concepts.update(self.metric_concepts["blood_pressure"])
-            source_conditions.append("metric:bp_present")
-
-        # Extract concepts from medication classes needed
-        if missing_med_classes:
-            for med_class in missing_med_classes:
-                normalized = med_class.lower().strip()
-                source_conditions.append(f"missing_med:{normalized}")
-
-                if normalized in self.medication_concepts:
-                    concepts.update(self.medication_concepts[normalized])
-
-        # Add concepts from detected gap types
-        if gap_types:
-            for gap_type in gap_types:
-                source_conditions.append(f"gap:{gap_type}")
-
-                if gap_type in self.gap_concepts:
-                    concepts.update(self.gap_concepts[gap_type])
-
-        # Build final query string
-        # Remove duplicates and sort for consistency
-        concept_list = sorted(list(concepts))
-        query_text = " ".join(concept_list) + " guidelines clinical recommendations"
-
-        return ConceptQuery(
-            query_text=query_text,
-            concepts=concept_list,
-            source_conditions=source_conditions,
-            is_phi_safe=True,
+        return _build_concept_query(
+            tuple(diagnoses or ()),
+            has_a1c,
+            has_blood_pressure,
+            tuple(missing_med_classes or ()),
+            tuple(gap_types or ()),
         )
 
     def build_from_extracted_facts(self, facts) -> ConceptQuery:
@@ -295,7 +364,7 @@ class ConceptQueryBuilder:
                     diagnoses.append("hypertension")
 
         return self.build_query(
-            diagnoses=list(set(diagnoses)),
+            diagnoses=sorted(set(diagnoses)),
             gap_types=gap_types,
         )
 
@@ -309,28 +378,58 @@ class ConceptQueryBuilder:
         Returns:
             List of safe clinical terms
         """
-        safe_terms = []
+        return _extract_safe_terms(text)
+
 
-        # Split into words
-        words = text.replace(',', ' ').replace('.', ' ').split()
+# PHI patterns checked by validate_phi_safety, with the violation each reports
+PHI_PATTERNS = [
+    # Specific numeric values (A1C, BP, etc.)
+    (re.compile(r'\d+\.\d+'), "Contains decimal number (possible A1C/lab value)"),
+    (re.compile(r'\d{2,3}/\d{2,3}'), "Contains fraction pattern (possible BP)"),
+    # Date patterns
+    (re.compile(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}'), "Contains date pattern"),
+    # Patient ID patterns
+    (re.compile(r'PT\d+|MRN\d+|patient.?id', re.IGNORECASE), "Contains patient identifier pattern"),
+]
 
-        for word in words:
-            # Skip numbers (could be patient values)
-            if any(char.isdigit() for char in word):
-                continue
+# All PHI_PATTERNS fused into one alternation for single-pass boolean checks
+_PHI_RE = re.compile(
+    "|".join(f"(?:{pattern.pattern})" for pattern, _ in PHI_PATTERNS),
+    re.IGNORECASE,
+)
 
-            # Skip very short words
-            if len(word) < 3:
-                continue
+# Capitalized abbreviations that are medical terms, not names
+MEDICAL_CAPS = frozenset({
+    'A1C', 'HBA1C', 'BP', 'LDL', 'HDL', 'ACE', 'ARB', 'BMI',
+    'GFR', 'EGFR', 'CKD', 'HTN', 'DM', 'CAD', 'CHF', 'SGLT2', 'GLP1',
+})
 
-            # Skip words that look like identifiers
-            if word.upper() == word and len(word) > 2:
-                continue
 
-            # Keep clinical-looking terms
-            safe_terms.append(word.lower())
+def _is_suspicious_caps(word: str) -> bool:
+    """Heuristic for names: all-caps words that aren't medical terms."""
+    return (
+        word.isupper() and len(word) > 2 and word not in MEDICAL_CAPS
+        and not any(char.isdigit() for char in word)
+    )
 
-        return safe_terms
+
+def is_phi_safe(query_text: str) -> bool:
+    """
+    Check whether a query string contains no PHI.
+
+    Boolean fast path for validate_phi_safety: a single fused regex scan
+    that stops at the first violation instead of collecting them all.
+    Use validate_phi_safety when the list of violations is needed.
+
+    Args:
+        query_text: The query string to check
+
+    Returns:
+        True if no PHI patterns were found
+    """
+    if _PHI_RE.search(query_text):
+        return False
+    return not any(_is_suspicious_caps(word) for word in query_text.split())
 
 
 def validate_phi_safety(query_text: str) -> tuple[bool, list[str]]:
@@ -348,31 +447,14 @@ def validate_phi_safety(query_text: str) -> tuple[bool, list[str]]:
     """
     violations = []
 
-    # Check for numeric values that could be patient data
-    import re
-
-    # Specific numeric values (A1C, BP, etc.)
-    if re.search(r'\d+\.\d+', query_text):
-        violations.append("Contains decimal number (possible A1C/lab value)")
-
-    if re.search(r'\d{2,3}/\d{2,3}', query_text):
-        violations.append("Contains fraction pattern (possible BP)")
-
-    # Date patterns
-    if re.search(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}', query_text):
-        violations.append("Contains date pattern")
-
-    # Patient ID patterns
-    if re.search(r'PT\d+|MRN\d+|patient.?id', query_text, re.IGNORECASE):
-        violations.append("Contains patient identifier pattern")
+    # Numeric values, dates, and patient identifiers
+    for pattern, violation in PHI_PATTERNS:
+        if pattern.search(query_text):
+            violations.append(violation)
 
     # Names (heuristic: capitalized words that aren't medical terms)
-    medical_caps = {'A1C', 'HBA1C', 'BP', 'LDL', 'HDL', 'ACE', 'ARB', 'BMI',
-                   'GFR', 'EGFR', 'CKD', 'HTN', 'DM', 'CAD', 'CHF', 'SGLT2', 'GLP1'}
-    words = query_text.split()
-    for word in words:
-        if word.isupper() and len(word) > 2 and word not in medical_caps:
-            if not any(char.isdigit() for char in word):
-                violations.append(f"Suspicious capitalized word: {word}")
+    for word in query_text.split():
+        if _is_suspicious_caps(word):
+            violations.append(f"Suspicious capitalized word: {word}")
 
     return (len(violations) == 0, violations)
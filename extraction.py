@@ -6,6 +6,8 @@ Uses regex-first approach with LLM fallback for robustness.
 import json
 import os
 import re
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field, asdict
 from typing import Optional
 
@@ -14,22 +16,53 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Word tokens of a medication line, e.g. "Losartan/HCTZ 50mg" -> losartan, hctz, mg
+MEDICATION_TOKEN_RE = re.compile(r"[a-z]+")
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ExtractedFacts:
-    """Structured clinical facts extracted from a patient note."""
+    """Structured clinical facts extracted from a patient note.
+
+    Immutable and slotted: one instance is created per note, so batch
+    extraction keeps per-instance memory and attribute access cheap.
+    List inputs for diagnoses/medications are stored as tuples.
+    """
 
     a1c: Optional[float] = None  # e.g., 8.2
     blood_pressure: Optional[dict] = None  # e.g., {"systolic": 140, "diastolic": 90}
-    diagnoses: list[str] = field(default_factory=list)  # e.g., ["Type 2 Diabetes", "Hypertension"]
-    medications: list[str] = field(default_factory=list)  # e.g., ["Metformin 500mg", "Lisinopril 10mg"]
+    diagnoses: tuple[str, ...] = ()  # e.g., ("Type 2 Diabetes", "Hypertension")
+    medications: tuple[str, ...] = ()  # e.g., ("Metformin 500mg", "Lisinopril 10mg")
     extraction_method: str = "regex"  # "regex" or "llm"
     confidence: float = 1.0  # 0.0-1.0
     raw_extractions: dict = field(default_factory=dict)  # For debugging
+    # Lowercased lookups derived from diagnoses/medications in __post_init__
+    diagnoses_lc: frozenset[str] = field(init=False, repr=False, compare=False)
+    medications_lc: frozenset[str] = field(init=False, repr=False, compare=False)
+    medication_tokens: frozenset[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Freeze list inputs and precompute lowercased lookup sets.
+
+        medication_tokens holds the word tokens of every medication line,
+        so drug-name checks are set lookups rather than substring scans.
+        """
+        diagnoses = tuple(self.diagnoses or ())
+        medications = tuple(self.medications or ())
+        object.__setattr__(self, "diagnoses", diagnoses)
+        object.__setattr__(self, "medications", medications)
+        object.__setattr__(self, "diagnoses_lc", frozenset(d.lower() for d in diagnoses))
+        medications_lc = frozenset(m.lower() for m in medications)
+        object.__setattr__(self, "medications_lc", medications_lc)
+        object.__setattr__(self, "medication_tokens", frozenset(
+            token for med in medications_lc for token in MEDICATION_TOKEN_RE.findall(med)
+        ))
 
     def to_dict(self) -> dict:
-        """Convert to dictionary."""
-        return asdict(self)
+        """Convert to dictionary (derived lookup fields excluded)."""
+        data = asdict(self)
+        del data["diagnoses_lc"], data["medications_lc"], data["medication_tokens"]
+        return data
 
     def is_complete(self) -> bool:
         """Check if all critical fields were extracted."""
@@ -108,6 +141,9 @@ class PatientFactExtractor:
         "chronic kidney disease": "Chronic Kidney Disease",
     }
 
+    # Max concurrent LLM fallback requests in extract_batch
+    MAX_LLM_WORKERS = 8
+
     def __init__(self):
         """Initialize the extractor with OpenAI client for LLM fallback."""
         api_key = os.getenv("OPENAI_API_KEY")
@@ -136,15 +172,72 @@ class PatientFactExtractor:
         # First try regex extraction
         facts = self._extract_with_regex(note_text)
 
-        # If extraction is incomplete, try LLM fallback
+        return self._apply_llm_fallback(facts, note_text)
+
+    def extract_batch(self, notes: list[str]) -> list[ExtractedFacts]:
+        """Extract clinical facts from many patient notes at once.
+
+        The A1C and BP patterns are scanned once over all notes joined with
+        a NUL separator (which neither pattern can match across), and each
+        match is bucketed back to its note by offset. Section parsing still
+        runs per note; notes that need the LLM fallback are sent to it
+        concurrently.
+
+        Args:
+            notes: Clinical note texts to extract from
+
+        Returns:
+            ExtractedFacts for each note, in input order
+        """
+        joined = "\x00".join(notes)
+
+        starts = []
+        offset = 0
+        for note_text in notes:
+            starts.append(offset)
+            offset += len(note_text) + 1
+
+        a1c_matches = self._first_match_per_note(self.PATTERNS["a1c"], joined, starts)
+        bp_matches = self._first_match_per_note(self.PATTERNS["bp"], joined, starts)
+
+        regex_facts = [
+            self._facts_from_matches(note_text, a1c_match, bp_match)
+            for note_text, a1c_match, bp_match in zip(notes, a1c_matches, bp_matches)
+        ]
+
+        if not self.client or all(facts.is_complete() for facts in regex_facts):
+            return regex_facts
+
+        # LLM fallback is network-bound, so incomplete notes are sent concurrently
+        with ThreadPoolExecutor(max_workers=min(self.MAX_LLM_WORKERS, len(notes))) as executor:
+            return list(executor.map(self._apply_llm_fallback, regex_facts, notes))
+
+    @staticmethod
+    def _first_match_per_note(pattern: re.Pattern, joined: str, starts: list[int]) -> list:
+        """Map each note to the first match of pattern within its span."""
+        matches = [None] * len(starts)
+        for match in pattern.finditer(joined):
+            i = bisect_right(starts, match.start()) - 1
+            if matches[i] is None:
+                matches[i] = match
+        return matches
+
+    def _apply_llm_fallback(self, facts: ExtractedFacts, note_text: str) -> ExtractedFacts:
+        """Fill in missing fields with the LLM when regex extraction is incomplete.
+
+        Args:
+            facts: Facts extracted via regex
+            note_text: The clinical note text
+
+        Returns:
+            The regex facts, or merged regex+LLM facts
+        """
         if not facts.is_complete() and self.client:
             missing = facts.missing_fields()
             llm_facts = self._extract_with_llm(note_text, missing)
 
-            # Merge LLM results into facts
+            # Merge LLM results into facts (as "regex+llm" with lower confidence)
             facts = self._merge_facts(facts, llm_facts)
-            facts.extraction_method = "regex+llm"
-            facts.confidence = 0.85  # Lower confidence for hybrid extraction
 
         return facts
 
@@ -154,6 +247,28 @@ class PatientFactExtractor:
         Args:
             note_text: The clinical note text
 
+        Returns:
+            ExtractedFacts with regex-extracted data
+        """
+        return self._facts_from_matches(
+            note_text,
+            self.PATTERNS["a1c"].search(note_text),
+            self.PATTERNS["bp"].search(note_text)
+        )
+
+    def _facts_from_matches(
+        self,
+        note_text: str,
+        a1c_match: Optional[re.Match],
+        bp_match: Optional[re.Match]
+    ) -> ExtractedFacts:
+        """Build regex-extracted facts from pre-scanned A1C/BP matches.
+
+        Args:
+            note_text: The clinical note text (for section parsing)
+            a1c_match: First A1C pattern match in the note, if any
+            bp_match: First BP pattern match in the note, if any
+
         Returns:
             ExtractedFacts with regex-extracted data
         """
@@ -161,7 +276,6 @@ class PatientFactExtractor:
 
         # Extract A1C
         a1c = None
-        a1c_match = self.PATTERNS["a1c"].search(note_text)
         if a1c_match:
             try:
                 a1c = float(a1c_match.group(1))
@@ -171,7 +285,6 @@ class PatientFactExtractor:
 
         # Extract Blood Pressure
         blood_pressure = None
-        bp_match = self.PATTERNS["bp"].search(note_text)
         if bp_match:
             try:
                 blood_pressure = {
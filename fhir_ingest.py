@@ -7,41 +7,60 @@ for unstructured clinical notes.
 """
 
 import json
+from typing import IO
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 LOINC_A1C = "4548-4"
+# Codes are matched as strings: frozenset membership is already O(1) as the
+# set grows, and parsing each coding to an int tuple costs more than the
+# string hash it would replace (non-numeric codes would also need handling).
+_A1C_CODES = frozenset({LOINC_A1C})
+
+
+def _loads(data: bytes) -> dict:
+    """Decode JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
-def parse_fhir_bundle(file_path: str) -> dict:
+def parse_fhir_bundle(source: str | bytes | dict | IO) -> dict:
     """Parse a FHIR R4 Bundle and extract patient name + A1C value.
 
     Args:
-        file_path: Path to a FHIR Bundle JSON file.
+        source: Path to a FHIR Bundle JSON file, raw JSON bytes, a readable
+            file-like object, or an already-parsed Bundle dict (the
+            non-path forms skip disk I/O for bulk ingestion).
 
     Returns:
         dict with keys:
             - patient_name (str or None): "Given Family" format
             - a1c_value (float or None): A1C percentage from Observation
     """
-    with open(file_path, "r") as f:
-        bundle = json.load(f)
-
-    patient_name = None
-    a1c_value = None
+    if isinstance(source, dict):
+        bundle = source
+    elif isinstance(source, (bytes, bytearray)):
+        bundle = _loads(source)
+    elif hasattr(source, "read"):
+        bundle = _loads(source.read())
+    else:
+        with open(source, "rb") as f:
+            bundle = _loads(f.read())
+
+    result = {"patient_name": None, "a1c_value": None}
 
     for entry in bundle.get("entry", []):
         resource = entry.get("resource", {})
-        resource_type = resource.get("resourceType")
-
-        if resource_type == "Patient":
-            patient_name = _extract_patient_name(resource)
-
-        elif resource_type == "Observation":
-            a1c = _extract_a1c(resource)
-            if a1c is not None:
-                a1c_value = a1c
+        handler = _HANDLERS.get(resource.get("resourceType"))
+        if handler is not None:
+            handler(resource, result)
 
-    return {"patient_name": patient_name, "a1c_value": a1c_value}
+    return result
 
 
 def _extract_patient_name(patient: dict) -> str | None:
@@ -57,10 +76,29 @@ def _extract_patient_name(patient: dict) -> str | None:
 
 
 def _extract_a1c(observation: dict) -> float | None:
-    """Extract A1C value if Observation has LOINC code 4548-4."""
+    """Extract A1C value if Observation has an A1C LOINC code (4548-4)."""
     codings = observation.get("code", {}).get("coding", [])
     for coding in codings:
-        if coding.get("code") == LOINC_A1C:
+        if coding.get("code") in _A1C_CODES:
             quantity = observation.get("valueQuantity", {})
             return quantity.get("value")
     return None
+
+
+def _handle_patient(resource: dict, result: dict) -> None:
+    """Record the patient name from a Patient resource."""
+    result["patient_name"] = _extract_patient_name(resource)
+
+
+def _handle_observation(resource: dict, result: dict) -> None:
+    """Record the A1C value from an Observation resource, if it is one."""
+    a1c = _extract_a1c(resource)
+    if a1c is not None:
+        result["a1c_value"] = a1c
+
+
+# resourceType -> handler; entries of other types are ignored
+_HANDLERS = {
+    "Patient": _handle_patient,
+    "Observation": _handle_observation,
+}
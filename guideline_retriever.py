@@ -24,9 +24,10 @@ from enum import Enum
 from pathlib import Path
 from typing import List, Dict, Optional
 
+import numpy as np
 from dotenv import load_dotenv
 
-from concept_query import ConceptQueryBuilder, ConceptQuery, validate_phi_safety
+from concept_query import ConceptQueryBuilder, ConceptQuery, is_phi_safe, validate_phi_safety
 from vector_store_faiss import FAISSIndex, get_guidelines_index, load_guidelines_from_markdown
 
 load_dotenv()
@@ -91,6 +92,14 @@ class FAISSGuidelineRetriever(BaseGuidelineRetriever):
         index = self._get_index()
         return index.query(query, top_k=top_k)
 
+    def encode(self, query: str) -> np.ndarray:
+        """Embed a query once for reuse with search_embedding()."""
+        return self._get_index().embed_query(query)
+
+    def search_embedding(self, embedding: np.ndarray, top_k: int = 3) -> List[Dict]:
+        """Search guidelines using a query embedding from encode()."""
+        return self._get_index().query_embedding(embedding, top_k=top_k)
+
     def is_available(self) -> bool:
         """FAISS is always available (local)."""
         try:
@@ -164,8 +173,8 @@ class PineconeGuidelineRetriever(BaseGuidelineRetriever):
         self._init_clients()
 
         # Validate PHI safety before sending to external service
-        is_safe, violations = validate_phi_safety(query)
-        if not is_safe:
+        if not is_phi_safe(query):
+            _, violations = validate_phi_safety(query)
             raise ValueError(
                 f"PHI detected in query - refusing to send to Pinecone. "
                 f"Violations: {violations}"
@@ -318,8 +327,8 @@ class GuidelineRetriever:
             RetrievalResult with guidelines
         """
         if not skip_phi_check and self.mode == RetrievalMode.ENTERPRISE:
-            is_safe, violations = validate_phi_safety(query)
-            if not is_safe:
+            if not is_phi_safe(query):
+                _, violations = validate_phi_safety(query)
                 raise ValueError(
                     f"PHI detected in raw query. Use search_with_facts() instead. "
                     f"Violations: {violations}"
@@ -6,7 +6,7 @@ LLM extracts facts, CODE reasons, LLM explains.
 
 from dataclasses import dataclass, field, asdict
 from typing import Optional
-from extraction import ExtractedFacts
+from extraction import ExtractedFacts, MEDICATION_TOKEN_RE
 
 
 @dataclass
@@ -61,15 +61,15 @@ class CareGapRules:
     BP_DIASTOLIC_TARGET = 90  # mmHg
 
     # ACE inhibitor / ARB medication names
-    ACE_INHIBITORS = [
+    ACE_INHIBITORS = frozenset({
         "lisinopril", "enalapril", "ramipril", "benazepril",
         "captopril", "fosinopril", "moexipril", "perindopril",
         "quinapril", "trandolapril"
-    ]
-    ARBS = [
+    })
+    ARBS = frozenset({
         "losartan", "valsartan", "irbesartan", "candesartan",
         "olmesartan", "telmisartan", "azilsartan", "eprosartan"
-    ]
+    })
 
     @classmethod
     def check_a1c_threshold(
@@ -90,8 +90,8 @@ class CareGapRules:
         """
         # Check if patient has diabetes
         has_diabetes = any(
-            "diabetes" in dx.lower()
-            for dx in facts.diagnoses
+            "diabetes" in dx
+            for dx in facts.diagnoses_lc
         )
 
         if not has_diabetes:
@@ -176,8 +176,8 @@ class CareGapRules:
             GapResult for HTN ACE/ARB check
         """
         # Check diagnoses
-        has_diabetes = any("diabetes" in dx.lower() for dx in facts.diagnoses)
-        has_htn = any("hypertension" in dx.lower() for dx in facts.diagnoses)
+        has_diabetes = any("diabetes" in dx for dx in facts.diagnoses_lc)
+        has_htn = any("hypertension" in dx for dx in facts.diagnoses_lc)
 
         if not has_diabetes or not has_htn:
             missing = []
@@ -205,19 +205,11 @@ class CareGapRules:
                 guideline_id="guideline_002_htn_ace_inhibitor"
             )
 
-        # Check medications for ACE inhibitor or ARB
-        meds_lower = [m.lower() for m in facts.medications]
+        # Check medications for ACE inhibitor or ARB (word-token set lookups)
+        med_tokens = facts.medication_tokens
 
-        has_ace = any(
-            ace in med
-            for med in meds_lower
-            for ace in cls.ACE_INHIBITORS
-        )
-        has_arb = any(
-            arb in med
-            for med in meds_lower
-            for arb in cls.ARBS
-        )
+        has_ace = not cls.ACE_INHIBITORS.isdisjoint(med_tokens)
+        has_arb = not cls.ARBS.isdisjoint(med_tokens)
 
         on_ace_or_arb = has_ace or has_arb
 
@@ -226,11 +218,11 @@ class CareGapRules:
             # Find the specific medication
             found_med = None
             for med in facts.medications:
-                med_lower = med.lower()
-                if any(ace in med_lower for ace in cls.ACE_INHIBITORS):
+                tokens = MEDICATION_TOKEN_RE.findall(med.lower())
+                if not cls.ACE_INHIBITORS.isdisjoint(tokens):
                     found_med = med
                     break
-                if any(arb in med_lower for arb in cls.ARBS):
+                if not cls.ARBS.isdisjoint(tokens):
                     found_med = med
                     break
 
@@ -293,7 +285,7 @@ class CareGapRules:
         Returns:
             GapResult for BP control check
         """
-        has_htn = any("hypertension" in dx.lower() for dx in facts.diagnoses)
+        has_htn = any("hypertension" in dx for dx in facts.diagnoses_lc)
 
         if not has_htn:
             return GapResult(
@@ -0,0 +1,35 @@
+"""Pytest configuration shared by all test modules.
+
+Makes the project root importable once per session, so test modules can
+import the flat top-level modules (extraction, reasoning_engine, ...)
+directly.
+"""
+
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+@pytest.fixture(scope="session")
+def seeded_db(tmp_path_factory):
+    """Freshly seeded database in a temp dir, installed as the shared instance.
+
+    Tests never touch data/careflow.db, so runs start from the same seed
+    and leave the working tree clean.
+    """
+    import care_database
+    from seed_care_data import seed_all
+
+    previous = care_database._db_instance
+    care_database._db_instance = None
+    db = care_database.get_database(str(tmp_path_factory.mktemp("db") / "careflow.db"))
+    seed_all()
+    yield db
+    db.close()
+    care_database._db_instance = previous
@@ -0,0 +1,40 @@
+"""Thread-pool runner shared by the test_suite.py suites.
+
+Suites that run independent test methods concurrently inherit from
+ParallelSuite and record results through _result_sink().
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ParallelSuite:
+    """Mixin that runs a suite's test methods on a thread pool."""
+
+    MAX_WORKERS = 8
+
+    def __init__(self):
+        self.results = []
+        self._local = threading.local()
+
+    def _result_sink(self) -> list:
+        """Results list for the current test: per-thread under run_all."""
+        return getattr(self._local, "results", self.results)
+
+    def _run_parallel(self, tests: list):
+        """Run independent test methods concurrently.
+
+        Each test records into its own thread-local list, and the lists are
+        appended in declaration order, so the report order is deterministic.
+        """
+        def run(test):
+            self._local.results = []
+            try:
+                test()
+                return self._local.results
+            finally:
+                del self._local.results
+
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            for results in executor.map(run, tests):
+                self.results.extend(results)
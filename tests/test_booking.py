@@ -3,14 +3,15 @@
 Tests appointment booking functionality.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from collections import namedtuple
 
 from tools import BookingTool, BookingResult
 from care_database import get_database
 
 
+_Result = namedtuple("_Result", ["test", "passed", "details"])
+
+
 class TestBooking:
     """Test suite for BookingTool."""
 
@@ -21,12 +22,7 @@ class TestBooking:
 
     def _assert(self, condition: bool, test_name: str, details: str = ""):
         """Record test result."""
-        status = "PASS" if condition else "FAIL"
-        self.results.append({
-            "test": test_name,
-            "passed": condition,
-            "details": details
-        })
+        self.results.append(_Result(test_name, condition, details))
         return condition
 
     def test_booking_creates_appointment(self):
@@ -272,14 +268,14 @@ class TestBooking:
         self.test_get_available_specialties()
         self.test_booking_result_message()
 
-        passed = sum(1 for r in self.results if r["passed"])
+        passed = sum(1 for r in self.results if r.passed)
         total = len(self.results)
 
         return {
             "suite": "Booking",
             "passed": passed,
             "total": total,
-            "results": self.results
+            "results": [r._asdict() for r in self.results]
         }
 
 
@@ -304,5 +300,6 @@ def run_tests():
     return results
 
 
+# Run standalone from the project root: python -m tests.test_booking
 if __name__ == "__main__":
     run_tests()
@@ -1,11 +1,7 @@
 """Tests for CareFlow Chaos Mode — deterministic failure injection."""
 
-import os
-import sys
 import unittest
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
 from chaos_mode import (
     ChaosConfig,
     ChaosError,
@@ -187,5 +183,6 @@ class TestChaosBlocksPatientAnalysis(unittest.TestCase):
         self.assertGreater(reasoning_result.gaps_found, 0)
 
 
+# Run standalone from the project root: python -m tests.test_chaos_mode
 if __name__ == "__main__":
     unittest.main()
@@ -3,19 +3,22 @@
 Tests that patient-specific data is properly de-identified before external queries.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from collections import namedtuple
 
 from concept_query import (
     ConceptQueryBuilder,
     ConceptQuery,
     validate_phi_safety,
+    is_phi_safe,
     DIAGNOSIS_CONCEPTS,
     MEDICATION_CLASS_CONCEPTS,
 )
 
 
+# Lightweight per-test record; converted to dicts only in run_all()'s return
+_Result = namedtuple("_Result", ["test", "passed", "details"])
+
+
 class TestConceptQuery:
     """Test suite for ConceptQueryBuilder."""
 
@@ -25,11 +28,7 @@ class TestConceptQuery:
 
     def _assert(self, condition: bool, test_name: str, details: str = ""):
         """Record test result."""
-        self.results.append({
-            "test": test_name,
-            "passed": condition,
-            "details": details
-        })
+        self.results.append(_Result(test_name, condition, details))
         return condition
 
     def test_diabetes_concepts_extracted(self):
@@ -156,12 +155,31 @@ class TestConceptQuery:
             f"Violations: {violations}"
         )
 
+    def test_is_phi_safe_matches_validator(self):
+        """Test: is_phi_safe fast path agrees with validate_phi_safety."""
+        queries = [
+            self.builder.build_query(diagnoses=["Type 2 Diabetes"]).query_text,
+            "diabetes patient with A1C 8.2 needs treatment",
+            "hypertension patient with BP 142/94",
+            "diabetes treatment started 01/15/2024",
+            "guidelines for PT001 diabetes management",
+            "diabetes guidelines for JOHNSON",
+        ]
+
+        mismatches = [q for q in queries if is_phi_safe(q) != validate_phi_safety(q)[0]]
+
+        return self._assert(
+            not mismatches,
+            "is_phi_safe matches validator",
+            f"Mismatches: {mismatches}"
+        )
+
     def test_query_has_clinical_suffix(self):
         """Test: Query text includes clinical/recommendations suffix."""
         query = self.builder.build_query(diagnoses=["Type 2 Diabetes"])
 
-        has_guidelines = "guidelines" in query.query_text.lower()
-        has_recommendations = "recommendations" in query.query_text.lower()
+        has_guidelines = "guidelines" in query.text_lower
+        has_recommendations = "recommendations" in query.text_lower
 
         return self._assert(
             has_guidelines or has_recommendations,
@@ -176,13 +194,13 @@ class TestConceptQuery:
             has_a1c=True
         )
 
-        has_diagnosis_source = any("diagnosis:" in s for s in query.source_conditions)
-        has_metric_source = any("metric:" in s for s in query.source_conditions)
+        has_diagnosis_source = "diagnosis" in query.source_conditions
+        has_metric_source = "metric" in query.source_conditions
 
         return self._assert(
             has_diagnosis_source and has_metric_source,
             "Source conditions tracked",
-            f"Sources: {query.source_conditions}"
+            f"Sources: {dict(query.source_conditions)}"
         )
 
     def test_concept_query_is_phi_safe_flag(self):
@@ -226,6 +244,35 @@ class TestConceptQuery:
             f"Concepts: {query.concepts[:6]}..."
         )
 
+    def test_build_query_memoized(self):
+        """Test: Identical inputs return the cached ConceptQuery."""
+        first = self.builder.build_query(diagnoses=["Type 2 Diabetes"], has_a1c=True)
+        second = self.builder.build_query(diagnoses=("Type 2 Diabetes",), has_a1c=True)
+        other = self.builder.build_query(diagnoses=["Hypertension"], has_a1c=True)
+
+        return self._assert(
+            first is second and first is not other,
+            "Build query memoized",
+            f"Same object for identical inputs: {first is second}"
+        )
+
+    def test_cached_query_is_immutable(self):
+        """Test: Cached queries are shared across builders and can't be mutated."""
+        first = self.builder.build_query(diagnoses=["Type 2 Diabetes"], has_a1c=True)
+        shared = ConceptQueryBuilder().build_query(diagnoses=["Type 2 Diabetes"], has_a1c=True)
+
+        try:
+            first.source_conditions["diagnosis"] = ("hypertension",)
+            mutable = True
+        except TypeError:
+            mutable = False
+
+        return self._assert(
+            first is shared and not mutable,
+            "Cached query immutable",
+            f"Shared across builders: {first is shared}, mutable: {mutable}"
+        )
+
     def test_safe_term_extraction(self):
         """Test: _extract_safe_terms filters out numbers and identifiers."""
         # Use the private method through the builder
@@ -259,21 +306,24 @@ class TestConceptQuery:
         self.test_phi_safety_catches_bp_pattern()
         self.test_phi_safety_catches_date_pattern()
         self.test_phi_safety_catches_patient_id()
+        self.test_is_phi_safe_matches_validator()
         self.test_query_has_clinical_suffix()
         self.test_source_conditions_tracked()
         self.test_concept_query_is_phi_safe_flag()
         self.test_multiple_diagnoses_combined()
         self.test_gap_type_concepts()
+        self.test_build_query_memoized()
+        self.test_cached_query_is_immutable()
         self.test_safe_term_extraction()
 
-        passed = sum(1 for r in self.results if r["passed"])
+        passed = sum(1 for r in self.results if r.passed)
         total = len(self.results)
 
         return {
             "suite": "Concept Query",
             "passed": passed,
             "total": total,
-            "results": self.results
+            "results": [r._asdict() for r in self.results]
         }
 
 
@@ -298,5 +348,6 @@ def run_tests():
     return results
 
 
+# Run standalone from the project root: python -m tests.test_concept_query
 if __name__ == "__main__":
     run_tests()
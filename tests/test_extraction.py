@@ -3,35 +3,35 @@
 Tests regex-first extraction of clinical facts from patient notes.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from collections import namedtuple
 
 from extraction import PatientFactExtractor, ExtractedFacts
 from care_database import get_database
 
 
+PATIENT_IDS = ("PT001", "PT002", "PT003", "PT004", "PT005")
+
+# Lightweight per-test record; converted to dicts only in run_all()'s return
+_Result = namedtuple("_Result", ["test", "passed", "details"])
+
+
 class TestExtraction:
-    """Test suite for PatientFactExtractor."""
+    """Test suite for PatientFactExtractor (run via test_suite.py)."""
 
     def __init__(self):
         self.extractor = PatientFactExtractor()
         self.db = get_database()
+        self.notes = self.db.get_latest_notes(PATIENT_IDS)
         self.results = []
 
     def _assert(self, condition: bool, test_name: str, details: str = ""):
         """Record test result."""
-        status = "PASS" if condition else "FAIL"
-        self.results.append({
-            "test": test_name,
-            "passed": condition,
-            "details": details
-        })
+        self.results.append(_Result(test_name, condition, details))
         return condition
 
     def test_maria_garcia_a1c(self):
         """Test: Regex extracts A1C = 8.2 from Maria Garcia's note."""
-        note = self.db.get_latest_note("PT001")
+        note = self.notes["PT001"]
         facts = self.extractor.extract(note["note_text"])
 
         return self._assert(
@@ -42,11 +42,11 @@ class TestExtraction:
 
     def test_maria_garcia_diagnoses(self):
         """Test: Regex extracts diagnoses including Hypertension."""
-        note = self.db.get_latest_note("PT001")
+        note = self.notes["PT001"]
         facts = self.extractor.extract(note["note_text"])
 
-        # Check for hypertension (case-insensitive)
-        has_htn = any("hypertension" in dx.lower() for dx in facts.diagnoses)
+        # Check for hypertension (diagnoses are normalized by the extractor)
+        has_htn = "essential hypertension" in facts.diagnoses_lc
 
         return self._assert(
             has_htn,
@@ -56,11 +56,11 @@ class TestExtraction:
 
     def test_maria_garcia_medications(self):
         """Test: Maria Garcia is NOT on Lisinopril (care gap exists)."""
-        note = self.db.get_latest_note("PT001")
+        note = self.notes["PT001"]
         facts = self.extractor.extract(note["note_text"])
 
         # Check that Lisinopril is NOT in medications
-        has_lisinopril = any("lisinopril" in med.lower() for med in facts.medications)
+        has_lisinopril = "lisinopril" in facts.medication_tokens
 
         return self._assert(
             not has_lisinopril,
@@ -70,7 +70,7 @@ class TestExtraction:
 
     def test_maria_garcia_blood_pressure(self):
         """Test: Regex extracts BP = 142/94 from Maria Garcia."""
-        note = self.db.get_latest_note("PT001")
+        note = self.notes["PT001"]
         facts = self.extractor.extract(note["note_text"])
 
         bp_correct = (
@@ -87,7 +87,7 @@ class TestExtraction:
 
     def test_maria_garcia_extraction_method(self):
         """Test: Extraction uses regex (not LLM fallback)."""
-        note = self.db.get_latest_note("PT001")
+        note = self.notes["PT001"]
         facts = self.extractor.extract(note["note_text"])
 
         return self._assert(
@@ -98,13 +98,13 @@ class TestExtraction:
 
     def test_james_wilson_extraction(self):
         """Test: James Wilson (PT002) extracts correctly."""
-        note = self.db.get_latest_note("PT002")
+        note = self.notes["PT002"]
         facts = self.extractor.extract(note["note_text"])
 
         # James has A1C 7.4, BP 128/82, on Lisinopril
         a1c_ok = facts.a1c == 7.4
         bp_ok = facts.blood_pressure and facts.blood_pressure.get("systolic") == 128
-        has_lisinopril = any("lisinopril" in med.lower() for med in facts.medications)
+        has_lisinopril = "lisinopril" in facts.medication_tokens
 
         all_ok = a1c_ok and bp_ok and has_lisinopril
 
@@ -116,7 +116,7 @@ class TestExtraction:
 
     def test_sarah_chen_extraction(self):
         """Test: Sarah Chen (PT003) extracts correctly."""
-        note = self.db.get_latest_note("PT003")
+        note = self.notes["PT003"]
         facts = self.extractor.extract(note["note_text"])
 
         # Sarah has A1C 9.1, newly diagnosed
@@ -130,7 +130,7 @@ class TestExtraction:
 
     def test_robert_johnson_extraction(self):
         """Test: Robert Johnson (PT004) extracts correctly."""
-        note = self.db.get_latest_note("PT004")
+        note = self.notes["PT004"]
         facts = self.extractor.extract(note["note_text"])
 
         # Robert has A1C 6.8, BP 148/94, HTN but no ACE/ARB
@@ -145,7 +145,7 @@ class TestExtraction:
 
     def test_linda_martinez_extraction(self):
         """Test: Linda Martinez (PT005) extracts correctly."""
-        note = self.db.get_latest_note("PT005")
+        note = self.notes["PT005"]
         facts = self.extractor.extract(note["note_text"])
 
         # Linda has A1C 7.0, at goal
@@ -159,16 +159,9 @@ class TestExtraction:
 
     def test_all_patients_use_regex(self):
         """Test: All 5 patients extract with regex (no LLM fallback needed)."""
-        patients = ["PT001", "PT002", "PT003", "PT004", "PT005"]
-        all_regex = True
-
-        for patient_id in patients:
-            note = self.db.get_latest_note(patient_id)
-            if note:
-                facts = self.extractor.extract(note["note_text"])
-                if facts.extraction_method != "regex":
-                    all_regex = False
-                    break
+        note_texts = [self.notes[pid]["note_text"] for pid in PATIENT_IDS if self.notes[pid]]
+        all_facts = self.extractor.extract_batch(note_texts)
+        all_regex = all(facts.extraction_method == "regex" for facts in all_facts)
 
         return self._assert(
             all_regex,
@@ -179,16 +172,16 @@ class TestExtraction:
     def test_negation_handling(self):
         """Test: Negated diagnoses are not extracted as positive diagnoses."""
         # Test using a real patient note (PT005) which has "No hypertension"
-        note = self.db.get_latest_note("PT005")
+        note = self.notes["PT005"]
         facts = self.extractor.extract(note["note_text"])
 
         # PT005's note says "No hypertension" - should NOT appear as a diagnosis
         # But should have diabetes
-        has_diabetes = any("diabetes" in dx.lower() for dx in facts.diagnoses)
+        has_diabetes = "type 2 diabetes mellitus" in facts.diagnoses_lc
 
         # Check that "hypertension" is NOT in the diagnosis list
         # (since it's negated in the note)
-        has_hypertension = any("hypertension" in dx.lower() for dx in facts.diagnoses)
+        has_hypertension = "essential hypertension" in facts.diagnoses_lc
 
         return self._assert(
             has_diabetes and not has_hypertension,
@@ -213,14 +206,14 @@ class TestExtraction:
         self.test_all_patients_use_regex()
         self.test_negation_handling()
 
-        passed = sum(1 for r in self.results if r["passed"])
+        passed = sum(1 for r in self.results if r.passed)
         total = len(self.results)
 
         return {
             "suite": "Extraction",
             "passed": passed,
             "total": total,
-            "results": self.results
+            "results": [r._asdict() for r in self.results]
         }
 
 
@@ -245,5 +238,6 @@ def run_tests():
     return results
 
 
+# Run standalone from the project root: python -m tests.test_extraction
 if __name__ == "__main__":
     run_tests()
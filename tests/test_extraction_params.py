@@ -0,0 +1,20 @@
+"""Pytest checks for the extraction layer.
+
+Kept apart from tests/test_extraction.py so test_suite.py can import
+TestExtraction without needing pytest installed. Per-patient values are
+covered by TestExtraction; this module checks batch extraction.
+"""
+
+from extraction import PatientFactExtractor
+
+
+def test_extract_batch_matches_extract(seeded_db):
+    """Test: extract_batch gives the same facts as extract, note by note."""
+    patient_ids = [p["patient_id"] for p in seeded_db.get_all_patients()]
+    notes = seeded_db.get_latest_notes(patient_ids)
+    note_texts = [notes[pid]["note_text"] for pid in patient_ids]
+    assert note_texts
+
+    extractor = PatientFactExtractor()
+    batch = extractor.extract_batch(note_texts)
+    assert batch == [extractor.extract(text) for text in note_texts]
@@ -1,13 +1,10 @@
 """Tests for FHIR dual-mode ingestion."""
 
+import io
 import json
 import os
-import tempfile
 import unittest
 
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
 from fhir_ingest import parse_fhir_bundle
 
 
@@ -78,41 +75,39 @@ BUNDLE_NO_A1C = {
 }
 
 
-def _write_bundle(bundle: dict) -> str:
-    """Write a bundle dict to a temp file and return the path."""
-    fd, path = tempfile.mkstemp(suffix=".json")
-    with os.fdopen(fd, "w") as f:
-        json.dump(bundle, f)
-    return path
+SAMPLE_BUNDLE_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "fhir_bundle.json")
 
 
 class TestFHIRIngest(unittest.TestCase):
 
     def test_extract_patient_name(self):
-        path = _write_bundle(SAMPLE_BUNDLE)
-        try:
-            result = parse_fhir_bundle(path)
-            self.assertEqual(result["patient_name"], "John Smith")
-        finally:
-            os.unlink(path)
+        result = parse_fhir_bundle(json.dumps(SAMPLE_BUNDLE).encode())
+        self.assertEqual(result["patient_name"], "John Smith")
 
     def test_extract_a1c_value(self):
-        path = _write_bundle(SAMPLE_BUNDLE)
-        try:
-            result = parse_fhir_bundle(path)
-            self.assertAlmostEqual(result["a1c_value"], 8.2)
-        finally:
-            os.unlink(path)
+        result = parse_fhir_bundle(json.dumps(SAMPLE_BUNDLE).encode())
+        self.assertAlmostEqual(result["a1c_value"], 8.2)
 
     def test_missing_a1c_returns_none(self):
-        path = _write_bundle(BUNDLE_NO_A1C)
-        try:
-            result = parse_fhir_bundle(path)
-            self.assertEqual(result["patient_name"], "Jane Doe")
-            self.assertIsNone(result["a1c_value"])
-        finally:
-            os.unlink(path)
+        result = parse_fhir_bundle(json.dumps(BUNDLE_NO_A1C).encode())
+        self.assertEqual(result["patient_name"], "Jane Doe")
+        self.assertIsNone(result["a1c_value"])
+
+    def test_accepts_file_like(self):
+        result = parse_fhir_bundle(io.BytesIO(json.dumps(SAMPLE_BUNDLE).encode()))
+        self.assertEqual(result["patient_name"], "John Smith")
+
+    def test_accepts_file_path(self):
+        result = parse_fhir_bundle(SAMPLE_BUNDLE_FILE)
+        self.assertEqual(result["patient_name"], "John Smith")
+        self.assertAlmostEqual(result["a1c_value"], 8.2)
+
+    def test_accepts_parsed_bundle(self):
+        result = parse_fhir_bundle(SAMPLE_BUNDLE)
+        self.assertEqual(result["patient_name"], "John Smith")
+        self.assertAlmostEqual(result["a1c_value"], 8.2)
 
 
+# Run standalone from the project root: python -m tests.test_fhir_ingest
 if __name__ == "__main__":
     unittest.main()
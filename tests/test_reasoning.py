@@ -3,48 +3,68 @@
 Tests deterministic gap detection rules.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from collections import namedtuple
+from functools import lru_cache
 
 from extraction import PatientFactExtractor, ExtractedFacts
 from reasoning_engine import ReasoningEngine, CareGapRules, GapResult
 from care_database import get_database
+from tests.parallel_suite import ParallelSuite
 
 
-class TestReasoning:
+# Same record shape as the other suites; details holds a zero-argument
+# callable until run_all() formats it
+_Result = namedtuple("_Result", ["test", "passed", "details"])
+
+
+# Patients whose real notes the end-to-end gap tests evaluate
+PATIENT_IDS = ("PT001", "PT002", "PT004")
+
+
+@lru_cache(maxsize=None)
+def _facts_for(note_text: str) -> ExtractedFacts:
+    """Extract facts from a note, once per process.
+
+    ExtractedFacts is immutable, so tests can safely share the result.
+    """
+    return PatientFactExtractor().extract(note_text)
+
+
+# Shared immutable fixture: diabetic on metformin with A1C above goal
+_DM_FACTS_A1C_82 = ExtractedFacts(
+    a1c=8.2,
+    diagnoses=("Type 2 Diabetes Mellitus",),
+    medications=("Metformin 1000mg",)
+)
+
+
+class TestReasoning(ParallelSuite):
     """Test suite for ReasoningEngine."""
 
     def __init__(self):
+        super().__init__()
         self.engine = ReasoningEngine()
-        self.extractor = PatientFactExtractor()
-        self.db = get_database()
-        self.results = []
+        # One query for every patient note the suite needs, made before
+        # tests run on worker threads
+        self.notes = get_database().get_latest_notes(PATIENT_IDS)
+
+    def _assert(self, condition: bool, test_name: str, details_fn=None):
+        """Record test result.
 
-    def _assert(self, condition: bool, test_name: str, details: str = ""):
-        """Record test result."""
-        status = "PASS" if condition else "FAIL"
-        self.results.append({
-            "test": test_name,
-            "passed": condition,
-            "details": details
-        })
+        details_fn is a zero-argument callable returning the details
+        string; it is only called once the tests have run.
+        """
+        self._result_sink().append(_Result(test_name, condition, details_fn))
         return condition
 
     def test_a1c_gap_above_threshold(self):
         """Test: A1C 8.2 > 7.0 -> gap_detected = True."""
-        facts = ExtractedFacts(
-            a1c=8.2,
-            diagnoses=["Type 2 Diabetes Mellitus"],
-            medications=["Metformin 1000mg"]
-        )
-
-        gap = CareGapRules.check_a1c_threshold(facts, "TEST001")
+        gap = CareGapRules.check_a1c_threshold(_DM_FACTS_A1C_82, "TEST001")
 
         return self._assert(
             gap.gap_detected is True,
             "A1C 8.2 > 7.0 gap detected",
-            f"gap_detected={gap.gap_detected}, comparison='{gap.comparison}'"
+            lambda: f"gap_detected={gap.gap_detected}, comparison='{gap.comparison}'"
         )
 
     def test_a1c_gap_below_threshold(self):
@@ -60,7 +80,7 @@ class TestReasoning:
         return self._assert(
             gap.gap_detected is False,
             "A1C 6.8 < 7.0 no gap",
-            f"gap_detected={gap.gap_detected}, therefore='{gap.therefore}'"
+            lambda: f"gap_detected={gap.gap_detected}, therefore='{gap.therefore}'"
         )
 
     def test_a1c_gap_at_threshold(self):
@@ -76,7 +96,7 @@ class TestReasoning:
         return self._assert(
             gap.gap_detected is True,
             "A1C 7.0 at threshold is a gap",
-            f"gap_detected={gap.gap_detected}"
+            lambda: f"gap_detected={gap.gap_detected}"
         )
 
     def test_htn_gap_no_ace_arb(self):
@@ -92,7 +112,7 @@ class TestReasoning:
         return self._assert(
             gap.gap_detected is True,
             "HTN + DM + no ACE/ARB gap detected",
-            f"gap_detected={gap.gap_detected}, recommendation='{gap.recommendation[:50]}...'"
+            lambda: f"gap_detected={gap.gap_detected}, recommendation='{gap.recommendation[:50]}...'"
         )
 
     def test_htn_gap_with_lisinopril(self):
@@ -108,7 +128,7 @@ class TestReasoning:
         return self._assert(
             gap.gap_detected is False,
             "HTN + DM + Lisinopril no gap",
-            f"gap_detected={gap.gap_detected}, therefore='{gap.therefore}'"
+            lambda: f"gap_detected={gap.gap_detected}, therefore='{gap.therefore}'"
         )
 
     def test_htn_gap_with_losartan(self):
@@ -124,7 +144,7 @@ class TestReasoning:
         return self._assert(
             gap.gap_detected is False,
             "HTN + DM + Losartan (ARB) no gap",
-            f"gap_detected={gap.gap_detected}"
+            lambda: f"gap_detected={gap.gap_detected}"
         )
 
     def test_bp_control_gap_elevated(self):
@@ -141,7 +161,7 @@ class TestReasoning:
         return self._assert(
             gap.gap_detected is True,
             "BP 142/94 elevated gap detected",
-            f"gap_detected={gap.gap_detected}, comparison='{gap.comparison}'"
+            lambda: f"gap_detected={gap.gap_detected}, comparison='{gap.comparison}'"
         )
 
     def test_bp_control_gap_normal(self):
@@ -158,27 +178,24 @@ class TestReasoning:
         return self._assert(
             gap.gap_detected is False,
             "BP 128/82 normal no gap",
-            f"gap_detected={gap.gap_detected}, therefore='{gap.therefore}'"
+            lambda: f"gap_detected={gap.gap_detected}, therefore='{gap.therefore}'"
         )
 
     def test_maria_garcia_has_3_gaps(self):
         """Test: Maria Garcia (PT001) has 3 gaps."""
-        note = self.db.get_latest_note("PT001")
-        facts = self.extractor.extract(note["note_text"])
+        facts = _facts_for(self.notes["PT001"]["note_text"])
         result = self.engine.evaluate_patient(facts, "PT001")
 
-        detected = [g for g in result.gaps if g.gap_detected]
-
         return self._assert(
             result.gaps_found == 3,
             "Maria Garcia has 3 gaps",
-            f"Found {result.gaps_found} gaps: {[g.gap_type for g in detected]}"
+            lambda: f"Found {result.gaps_found} gaps: "
+                    f"{[g.gap_type for g in result.gaps if g.gap_detected]}"
         )
 
     def test_james_wilson_minimal_gaps(self):
         """Test: James Wilson (PT002) is well-controlled with minimal gaps."""
-        note = self.db.get_latest_note("PT002")
-        facts = self.extractor.extract(note["note_text"])
+        facts = _facts_for(self.notes["PT002"]["note_text"])
         result = self.engine.evaluate_patient(facts, "PT002")
 
         # James has A1C 7.4 (borderline), so should have 1 gap (A1C threshold)
@@ -186,31 +203,25 @@ class TestReasoning:
         return self._assert(
             result.gaps_found <= 1,
             "James Wilson minimal gaps (well-controlled)",
-            f"Found {result.gaps_found} gaps, status: {result.overall_status}"
+            lambda: f"Found {result.gaps_found} gaps, status: {result.overall_status}"
         )
 
     def test_robert_johnson_has_2_gaps(self):
         """Test: Robert Johnson (PT004) has 2 gaps (ACE/ARB + BP)."""
-        note = self.db.get_latest_note("PT004")
-        facts = self.extractor.extract(note["note_text"])
+        facts = _facts_for(self.notes["PT004"]["note_text"])
         result = self.engine.evaluate_patient(facts, "PT004")
 
         # Robert has good A1C but HTN without ACE/ARB and elevated BP
         return self._assert(
             result.gaps_found == 2,
             "Robert Johnson has 2 gaps",
-            f"Found {result.gaps_found} gaps: {[g.gap_type for g in result.gaps if g.gap_detected]}"
+            lambda: f"Found {result.gaps_found} gaps: "
+                    f"{[g.gap_type for g in result.gaps if g.gap_detected]}"
         )
 
     def test_gap_result_has_citations(self):
         """Test: Gap results include proper citations."""
-        facts = ExtractedFacts(
-            a1c=8.2,
-            diagnoses=["Type 2 Diabetes Mellitus"],
-            medications=["Metformin 1000mg"]
-        )
-
-        gap = CareGapRules.check_a1c_threshold(facts, "PT001")
+        gap = CareGapRules.check_a1c_threshold(_DM_FACTS_A1C_82, "PT001")
 
         has_patient_citation = "PATIENT:" in gap.patient_fact.get("source", "")
         has_guideline_citation = gap.guideline_id != ""
@@ -218,7 +229,7 @@ class TestReasoning:
         return self._assert(
             has_patient_citation and has_guideline_citation,
             "Gap results have citations",
-            f"Patient source: {gap.patient_fact.get('source')}, Guideline: {gap.guideline_id}"
+            lambda: f"Patient source: {gap.patient_fact.get('source')}, Guideline: {gap.guideline_id}"
         )
 
     def test_gap_severity_high_for_a1c_above_9(self):
@@ -234,25 +245,19 @@ class TestReasoning:
         return self._assert(
             gap.severity == "high",
             "A1C > 9.0 is high severity",
-            f"A1C={facts.a1c}, severity={gap.severity}"
+            lambda: f"A1C={facts.a1c}, severity={gap.severity}"
         )
 
     def test_therefore_statement_format(self):
         """Test: Gap results have 'Therefore' statement."""
-        facts = ExtractedFacts(
-            a1c=8.2,
-            diagnoses=["Type 2 Diabetes Mellitus"],
-            medications=["Metformin 1000mg"]
-        )
-
-        gap = CareGapRules.check_a1c_threshold(facts, "TEST010")
+        gap = CareGapRules.check_a1c_threshold(_DM_FACTS_A1C_82, "TEST010")
 
         has_therefore = gap.therefore.startswith("Therefore")
 
         return self._assert(
             has_therefore,
             "Gap has 'Therefore' statement",
-            f"therefore='{gap.therefore}'"
+            lambda: f"therefore='{gap.therefore}'"
         )
 
     def run_all(self) -> dict:
@@ -260,29 +265,34 @@ class TestReasoning:
         self.results = []
 
         # Run all test methods
-        self.test_a1c_gap_above_threshold()
-        self.test_a1c_gap_below_threshold()
-        self.test_a1c_gap_at_threshold()
-        self.test_htn_gap_no_ace_arb()
-        self.test_htn_gap_with_lisinopril()
-        self.test_htn_gap_with_losartan()
-        self.test_bp_control_gap_elevated()
-        self.test_bp_control_gap_normal()
-        self.test_maria_garcia_has_3_gaps()
-        self.test_james_wilson_minimal_gaps()
-        self.test_robert_johnson_has_2_gaps()
-        self.test_gap_result_has_citations()
-        self.test_gap_severity_high_for_a1c_above_9()
-        self.test_therefore_statement_format()
-
-        passed = sum(1 for r in self.results if r["passed"])
+        self._run_parallel([
+            self.test_a1c_gap_above_threshold,
+            self.test_a1c_gap_below_threshold,
+            self.test_a1c_gap_at_threshold,
+            self.test_htn_gap_no_ace_arb,
+            self.test_htn_gap_with_lisinopril,
+            self.test_htn_gap_with_losartan,
+            self.test_bp_control_gap_elevated,
+            self.test_bp_control_gap_normal,
+            self.test_maria_garcia_has_3_gaps,
+            self.test_james_wilson_minimal_gaps,
+            self.test_robert_johnson_has_2_gaps,
+            self.test_gap_result_has_citations,
+            self.test_gap_severity_high_for_a1c_above_9,
+            self.test_therefore_statement_format,
+        ])
+
+        passed = sum(1 for r in self.results if r.passed)
         total = len(self.results)
 
         return {
             "suite": "Reasoning",
             "passed": passed,
             "total": total,
-            "results": self.results
+            "results": [
+                r._replace(details=r.details() if r.details else "")._asdict()
+                for r in self.results
+            ]
         }
 
 
@@ -307,5 +317,6 @@ def run_tests():
     return results
 
 
+# Run standalone from the project root: python -m tests.test_reasoning
 if __name__ == "__main__":
     run_tests()
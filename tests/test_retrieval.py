@@ -3,9 +3,9 @@
 Tests the retrieval system with mode switching and PHI protection.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import re
+from collections import namedtuple
+from functools import lru_cache, partial
 
 from guideline_retriever import (
     GuidelineRetriever,
@@ -15,48 +15,93 @@ from guideline_retriever import (
     get_retrieval_mode_from_args,
 )
 from concept_query import ConceptQueryBuilder
+from tests.parallel_suite import ParallelSuite
 
 
-class TestRetrieval:
+# Same record shape as the other suites; details holds a zero-argument
+# callable until run_all() formats it
+_Result = namedtuple("_Result", ["test", "passed", "details"])
+
+# A1C-related wording; unanchored so "HbA1c" still counts, as before
+_RELEVANT_RE = re.compile(r"a1c|glycemic", re.IGNORECASE)
+
+
+@lru_cache(maxsize=8)
+def _get_retriever(**kwargs) -> GuidelineRetriever:
+    """Shared GuidelineRetriever per constructor arguments so indexes load once.
+
+    Arguments are passed through unchanged, so tests of constructor
+    defaults still exercise the defaults.
+    """
+    return GuidelineRetriever(**kwargs)
+
+
+@lru_cache(maxsize=64)
+def _cached_search(query: str, top_k: int, skip_phi_check: bool) -> RetrievalResult:
+    """Memoized LOCAL-mode search_raw so repeated queries embed only once.
+
+    Call positionally - lru_cache keys keyword and positional calls apart.
+    """
+    return _get_retriever(mode=RetrievalMode.LOCAL).search_raw(
+        query, top_k=top_k, skip_phi_check=skip_phi_check
+    )
+
+
+def _get_faiss_retriever() -> FAISSGuidelineRetriever:
+    """FAISS backend of the shared LOCAL retriever, so its index loads once."""
+    return _get_retriever(mode=RetrievalMode.LOCAL)._faiss_retriever
+
+
+class TestRetrieval(ParallelSuite):
     """Test suite for GuidelineRetriever."""
 
     def __init__(self):
-        self.results = []
+        super().__init__()
         # Use LOCAL mode for tests (doesn't require Pinecone)
-        self.retriever = GuidelineRetriever(mode=RetrievalMode.LOCAL)
-
-    def _assert(self, condition: bool, test_name: str, details: str = ""):
-        """Record test result."""
-        self.results.append({
-            "test": test_name,
-            "passed": condition,
-            "details": details
-        })
+        self.retriever = _get_retriever(mode=RetrievalMode.LOCAL)
+        self.warmup()
+
+    def warmup(self):
+        """Load the FAISS index and embedding client before any test runs.
+
+        The first search pays the one-time index load; doing it here keeps
+        that cost out of whichever test happens to search first.
+        """
+        if _get_faiss_retriever().is_available():
+            self.retriever.search_raw("warmup", top_k=1, skip_phi_check=True)
+
+    def _assert(self, condition: bool, test_name: str, details_fn=None):
+        """Record test result.
+
+        details_fn is a zero-argument callable returning the details
+        string; it is only called once the tests have run.
+        """
+        self._result_sink().append(_Result(test_name, condition, details_fn))
         return condition
 
     def test_local_mode_initialization(self):
         """Test: Retriever initializes in LOCAL mode by default."""
-        retriever = GuidelineRetriever()
+        retriever = _get_retriever()
 
         return self._assert(
             retriever.mode == RetrievalMode.LOCAL,
             "Local mode initialization",
-            f"Mode: {retriever.mode.value}"
+            lambda: f"Mode: {retriever.mode.value}"
         )
 
     def test_enterprise_mode_initialization(self):
         """Test: Retriever can initialize in ENTERPRISE mode."""
-        retriever = GuidelineRetriever(mode=RetrievalMode.ENTERPRISE)
+        retriever = _get_retriever(mode=RetrievalMode.ENTERPRISE)
 
         return self._assert(
             retriever.mode == RetrievalMode.ENTERPRISE,
             "Enterprise mode initialization",
-            f"Mode: {retriever.mode.value}"
+            lambda: f"Mode: {retriever.mode.value}"
         )
 
     def test_faiss_retriever_available(self):
         """Test: FAISS retriever is available (local dependency)."""
-        faiss_retriever = FAISSGuidelineRetriever()
+        faiss_retriever = _get_faiss_retriever()
 
         # Check if FAISS can be imported
         is_available = faiss_retriever.is_available()
@@ -64,16 +109,12 @@ class TestRetrieval:
         return self._assert(
             is_available,
             "FAISS retriever available",
-            f"Available: {is_available}"
+            lambda: f"Available: {is_available}"
         )
 
     def test_search_raw_returns_result(self):
         """Test: search_raw returns RetrievalResult with guidelines."""
-        result = self.retriever.search_raw(
-            "diabetes a1c glycemic control guidelines",
-            top_k=3,
-            skip_phi_check=True
-        )
+        result = _cached_search("diabetes a1c glycemic control guidelines", 3, True)
 
         has_guidelines = len(result.guidelines) > 0
         correct_type = isinstance(result, RetrievalResult)
@@ -82,16 +123,12 @@ class TestRetrieval:
         return self._assert(
             has_guidelines and correct_type and is_faiss,
             "Search raw returns results",
-            f"Guidelines: {len(result.guidelines)}, Source: {result.source}"
+            lambda: f"Guidelines: {len(result.guidelines)}, Source: {result.source}"
         )
 
     def test_retrieval_result_structure(self):
         """Test: RetrievalResult has all required fields."""
-        result = self.retriever.search_raw(
-            "diabetes guidelines",
-            top_k=1,
-            skip_phi_check=True
-        )
+        result = _cached_search("diabetes guidelines", 1, True)
 
         has_guidelines = hasattr(result, "guidelines")
         has_mode = hasattr(result, "mode_used")
@@ -104,32 +141,25 @@ class TestRetrieval:
         return self._assert(
             all_fields,
             "RetrievalResult structure",
-            f"Has all required fields: {all_fields}"
+            lambda: f"Has all required fields: {all_fields}"
         )
 
     def test_result_marked_phi_safe(self):
         """Test: Results are marked as PHI-safe."""
-        result = self.retriever.search_raw(
-            "hypertension blood pressure guidelines",
-            skip_phi_check=True
-        )
+        result = _cached_search("hypertension blood pressure guidelines", 3, True)
 
         return self._assert(
             result.phi_safe == True,
             "Result marked PHI-safe",
-            f"PHI safe: {result.phi_safe}"
+            lambda: f"PHI safe: {result.phi_safe}"
         )
 
     def test_guideline_has_text_and_metadata(self):
         """Test: Retrieved guidelines have text and metadata."""
-        result = self.retriever.search_raw(
-            "diabetes a1c guidelines",
-            top_k=1,
-            skip_phi_check=True
-        )
+        result = _cached_search("diabetes a1c guidelines", 1, True)
 
         if not result.guidelines:
-            return self._assert(False, "Guideline structure", "No guidelines returned")
+            return self._assert(False, "Guideline structure", lambda: "No guidelines returned")
 
         guideline = result.guidelines[0]
         has_text = "text" in guideline and len(guideline["text"]) > 0
@@ -139,24 +169,33 @@ class TestRetrieval:
         return self._assert(
             has_text and has_metadata and has_score,
             "Guideline has text and metadata",
-            f"Text length: {len(guideline.get('text', ''))}, Has metadata: {has_metadata}"
+            lambda: f"Text length: {len(guideline.get('text', ''))}, Has metadata: {has_metadata}"
         )
 
     def test_top_k_limits_results(self):
         """Test: top_k parameter limits number of results."""
-        result_1 = self.retriever.search_raw("diabetes", top_k=1, skip_phi_check=True)
-        result_3 = self.retriever.search_raw("diabetes", top_k=3, skip_phi_check=True)
+        # search_raw honors top_k (same query as the single-result test)
+        raw_1 = _cached_search("diabetes guidelines", 1, True)
+
+        # Embed once on the warmed backend, then vary only top_k
+        faiss_retriever = _get_faiss_retriever()
+        embedding = faiss_retriever.encode("diabetes guidelines")
+        results_1 = faiss_retriever.search_embedding(embedding, top_k=1)
+        results_3 = faiss_retriever.search_embedding(embedding, top_k=3)
 
         return self._assert(
-            len(result_1.guidelines) <= 1 and len(result_3.guidelines) <= 3,
+            len(raw_1.guidelines) <= 1 and len(results_1) <= 1 and len(results_3) <= 3,
             "Top K limits results",
-            f"top_k=1: {len(result_1.guidelines)}, top_k=3: {len(result_3.guidelines)}"
+            lambda: (
+                f"search_raw top_k=1: {len(raw_1.guidelines)}, "
+                f"top_k=1: {len(results_1)}, top_k=3: {len(results_3)}"
+            )
         )
 
     def test_phi_check_blocks_unsafe_query_enterprise(self):
         """Test: PHI check blocks unsafe queries in enterprise mode."""
         # Create retriever but with fallback disabled so we get the error
-        retriever = GuidelineRetriever(
+        retriever = _get_retriever(
             mode=RetrievalMode.ENTERPRISE,
             fallback_to_local=False
         )
@@ -171,21 +210,18 @@ class TestRetrieval:
         return self._assert(
             blocked,
             "PHI check blocks unsafe query",
-            f"Query with PHI was blocked: {blocked}"
+            lambda: f"Query with PHI was blocked: {blocked}"
         )
 
     def test_local_mode_skips_phi_check_for_raw(self):
         """Test: LOCAL mode with skip_phi_check=True allows any query."""
         # In local mode, search_raw with skip_phi_check=True should work
-        result = self.retriever.search_raw(
-            "diabetes guidelines management",
-            skip_phi_check=True
-        )
+        result = _cached_search("diabetes guidelines management", 3, True)
 
         return self._assert(
             result is not None and result.source == "faiss",
             "Local mode raw search works",
-            f"Source: {result.source}"
+            lambda: f"Source: {result.source}"
         )
 
     def test_get_status_returns_info(self):
@@ -199,18 +235,18 @@ class TestRetrieval:
         return self._assert(
             has_mode and has_faiss and has_fallback,
             "Get status returns info",
-            f"Status keys: {list(status.keys())}"
+            lambda: f"Status keys: {list(status.keys())}"
         )
 
     def test_fallback_enabled_by_default(self):
         """Test: Fallback to local is enabled by default."""
-        retriever = GuidelineRetriever(mode=RetrievalMode.ENTERPRISE)
+        retriever = _get_retriever(mode=RetrievalMode.ENTERPRISE)
         status = retriever.get_status()
 
         return self._assert(
             status["fallback_enabled"] == True,
             "Fallback enabled by default",
-            f"Fallback: {status['fallback_enabled']}"
+            lambda: f"Fallback: {status['fallback_enabled']}"
         )
 
     def test_concept_builder_integration(self):
@@ -224,28 +260,23 @@ class TestRetrieval:
         return self._assert(
             has_builder and builder_correct_type,
             "Concept builder integration",
-            f"Has builder: {has_builder}, Correct type: {builder_correct_type}"
+            lambda: f"Has builder: {has_builder}, Correct type: {builder_correct_type}"
         )
 
     def test_search_returns_relevant_results(self):
         """Test: Search returns semantically relevant results."""
-        result = self.retriever.search_raw(
-            "a1c glycemic control diabetes target",
-            top_k=3,
-            skip_phi_check=True
-        )
+        result = _cached_search("a1c glycemic control diabetes target", 3, True)
 
         if not result.guidelines:
-            return self._assert(False, "Semantic relevance", "No results")
+            return self._assert(False, "Semantic relevance", lambda: "No results")
 
         # Check if A1C-related guideline is in results
-        texts = [g["text"].lower() for g in result.guidelines]
-        has_a1c_content = any("a1c" in t or "glycemic" in t for t in texts)
+        has_a1c_content = any(_RELEVANT_RE.search(g["text"]) for g in result.guidelines)
 
         return self._assert(
             has_a1c_content,
             "Search returns relevant results",
-            f"Found A1C-related content: {has_a1c_content}"
+            lambda: f"Found A1C-related content: {has_a1c_content}"
         )
 
     def test_retrieval_mode_enum_values(self):
@@ -256,38 +287,56 @@ class TestRetrieval:
         return self._assert(
             local_value and enterprise_value,
             "RetrievalMode enum values",
-            f"LOCAL={RetrievalMode.LOCAL.value}, ENTERPRISE={RetrievalMode.ENTERPRISE.value}"
+            lambda: f"LOCAL={RetrievalMode.LOCAL.value}, ENTERPRISE={RetrievalMode.ENTERPRISE.value}"
         )
 
+    def _skip(self, test_name: str, reason: str):
+        """Record a test that could not run as a failure."""
+        return self._assert(False, test_name, lambda: f"Skipped: {reason}")
+
     def run_all(self) -> dict:
         """Run all retrieval tests."""
         self.results = []
 
-        # Run all test methods
-        self.test_local_mode_initialization()
-        self.test_enterprise_mode_initialization()
-        self.test_faiss_retriever_available()
-        self.test_search_raw_returns_result()
-        self.test_retrieval_result_structure()
-        self.test_result_marked_phi_safe()
-        self.test_guideline_has_text_and_metadata()
-        self.test_top_k_limits_results()
-        self.test_phi_check_blocks_unsafe_query_enterprise()
-        self.test_local_mode_skips_phi_check_for_raw()
-        self.test_get_status_returns_info()
-        self.test_fallback_enabled_by_default()
-        self.test_concept_builder_integration()
-        self.test_search_returns_relevant_results()
-        self.test_retrieval_mode_enum_values()
-
-        passed = sum(1 for r in self.results if r["passed"])
+        # (test, display name, requires_faiss): FAISS-dependent tests are
+        # recorded as failures under their display name, without running,
+        # when the FAISS probe fails
+        tests = [
+            (self.test_local_mode_initialization, "Local mode initialization", False),
+            (self.test_enterprise_mode_initialization, "Enterprise mode initialization", False),
+            (self.test_faiss_retriever_available, "FAISS retriever available", False),
+            (self.test_search_raw_returns_result, "Search raw returns results", True),
+            (self.test_retrieval_result_structure, "RetrievalResult structure", True),
+            (self.test_result_marked_phi_safe, "Result marked PHI-safe", True),
+            (self.test_guideline_has_text_and_metadata, "Guideline has text and metadata", True),
+            (self.test_top_k_limits_results, "Top K limits results", True),
+            (self.test_phi_check_blocks_unsafe_query_enterprise, "PHI check blocks unsafe query", False),
+            (self.test_local_mode_skips_phi_check_for_raw, "Local mode raw search works", True),
+            (self.test_get_status_returns_info, "Get status returns info", False),
+            (self.test_fallback_enabled_by_default, "Fallback enabled by default", False),
+            (self.test_concept_builder_integration, "Concept builder integration", False),
+            (self.test_search_returns_relevant_results, "Search returns relevant results", True),
+            (self.test_retrieval_mode_enum_values, "RetrievalMode enum values", False),
+        ]
+        faiss_available = _get_faiss_retriever().is_available()
+
+        self._run_parallel([
+            test if faiss_available or not requires_faiss
+            else partial(self._skip, name, "FAISS not available")
+            for test, name, requires_faiss in tests
+        ])
+
+        passed = sum(1 for r in self.results if r.passed)
         total = len(self.results)
 
         return {
             "suite": "Retrieval",
             "passed": passed,
             "total": total,
-            "results": self.results
+            "results": [
+                r._replace(details=r.details() if r.details else "")._asdict()
+                for r in self.results
+            ]
         }
 
 
@@ -312,5 +361,6 @@ def run_tests():
     return results
 
 
+# Run standalone from the project root: python -m tests.test_retrieval
 if __name__ == "__main__":
     run_tests()
@@ -0,0 +1,132 @@
+"""Tests for the FAISS vector store index types and persistence."""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+try:
+    import faiss
+    from vector_store_faiss import FAISSIndex
+    HAS_FAISS = faiss is not None
+except ImportError:
+    HAS_FAISS = False
+
+
+class _FakeEmbeddings:
+    """Deterministic stand-in for the OpenAI embeddings endpoint."""
+
+    DIMENSION = 32
+
+    def create(self, model, input):
+        texts = [input] if isinstance(input, str) else input
+        return _FakeResponse([_FakeEmbedding(self._embed(text)) for text in texts])
+
+    def _embed(self, text: str) -> list[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:4], "little")
+        return np.random.default_rng(seed).random(self.DIMENSION).tolist()
+
+
+class _FakeEmbedding:
+    def __init__(self, embedding):
+        self.embedding = embedding
+
+
+class _FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class _FakeClient:
+    embeddings = _FakeEmbeddings()
+
+
+def _documents(count: int) -> list[dict]:
+    return [
+        {"id": f"doc-{i}", "text": f"guideline text {i}", "metadata": {"n": i}}
+        for i in range(count)
+    ]
+
+
+@unittest.skipUnless(HAS_FAISS, "Requires faiss")
+class TestIndexTypes(unittest.TestCase):
+    """Each index_type builds, queries, and round-trips through save/load."""
+
+    def setUp(self):
+        self.index_dir = tempfile.mkdtemp()
+        self.client = _FakeClient()
+
+    def tearDown(self):
+        shutil.rmtree(self.index_dir, ignore_errors=True)
+
+    def _new_index(self, **kwargs) -> FAISSIndex:
+        index = FAISSIndex(self.index_dir, **kwargs)
+        index.client = self.client
+        return index
+
+    def _assert_round_trip(self, index_type: str, count: int, expected_class):
+        index = self._new_index(index_type=index_type)
+        index.build_index(_documents(count))
+        self.assertIsInstance(index.index, expected_class)
+
+        before = index.query("guideline text 3", top_k=3)
+        self.assertEqual(len(before), 3)
+        index.save()
+
+        loaded = self._new_index()
+        self.assertTrue(loaded.load())
+        self.assertEqual(loaded.index.ntotal, count)
+        self.assertEqual(loaded.nlist, index.nlist)
+        self.assertEqual(loaded.quantizer, index.quantizer)
+        after = loaded.query("guideline text 3", top_k=3)
+        self.assertEqual([r["id"] for r in after], [r["id"] for r in before])
+        self.assertEqual(after[0]["metadata"], before[0]["metadata"])
+
+    def test_flat_round_trip(self):
+        self._assert_round_trip("flat", 20, faiss.IndexFlatIP)
+
+    def test_hnsw_round_trip(self):
+        self._assert_round_trip("hnsw", 20, faiss.IndexHNSWFlat)
+
+    def test_sq8_round_trip(self):
+        self._assert_round_trip("sq8", 20, faiss.IndexScalarQuantizer)
+
+    def test_ivf_round_trip(self):
+        self._assert_round_trip("ivf", 200, faiss.IndexIVFFlat)
+
+    def test_ivf_with_fewer_documents_than_min_nlist(self):
+        index = self._new_index(index_type="ivf")
+        index.build_index(_documents(10))
+        self.assertLessEqual(index.nlist, 10)
+        self.assertEqual(len(index.query("guideline text 3", top_k=3)), 3)
+
+    def test_save_replaces_index_file_of_loaded_index(self):
+        index = self._new_index(index_type="flat")
+        index.build_index(_documents(200))
+        index.save()
+        loaded = self._new_index()
+        self.assertTrue(loaded.load())
+        index_file = f"{self.index_dir}/index.faiss"
+        old_inode = os.stat(index_file).st_ino
+
+        rebuilt = self._new_index(index_type="flat")
+        rebuilt.build_index(_documents(5))
+        rebuilt.save()
+
+        # A new file, not an in-place rewrite of the one `loaded` maps
+        self.assertNotEqual(os.stat(index_file).st_ino, old_inode)
+        self.assertEqual(len(loaded.query("guideline text 3", top_k=3)), 3)
+        self.assertFalse([f for f in os.listdir(self.index_dir) if f.endswith(".tmp")])
+
+    def test_auto_uses_flat_for_small_sets(self):
+        index = self._new_index()
+        index.build_index(_documents(20))
+        self.assertIsInstance(index.index, faiss.IndexFlatIP)
+
+
+# Run standalone from the project root: python -m tests.test_vector_store
+if __name__ == "__main__":
+    unittest.main()
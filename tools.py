@@ -3,11 +3,14 @@
 Includes booking tool, vector search, and clinical utilities.
 """
 
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
-from typing import Optional
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from types import MappingProxyType
+from typing import Mapping, Optional
 import os
+import time
 
+import numpy as np
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -28,8 +31,12 @@ class BookingResult:
     error: Optional[str] = None
 
     def to_dict(self) -> dict:
-        """Convert to dictionary."""
-        return asdict(self)
+        """Convert to dictionary.
+
+        Every field is a scalar, so a shallow copy of the instance dict
+        matches asdict() without its recursive deep copy.
+        """
+        return dict(self.__dict__)
 
 
 class BookingTool:
@@ -46,6 +53,9 @@ class BookingTool:
         "EYE_EXAM": "Ophthalmology",
     }
 
+    # The doctor roster rarely changes; cache what we derive from it this long
+    SPECIALTIES_TTL_SECONDS = 60
+
     def __init__(self, db=None):
         """Initialize booking tool with database connection.
 
@@ -53,6 +63,9 @@ class BookingTool:
             db: CareDatabase instance (will get from singleton if not provided)
         """
         self.db = db
+        self._specialties: Optional[tuple[str, ...]] = None
+        self._specialty_pool: dict[str, list[dict]] = {}
+        self._specialties_expires_at = 0.0
 
     def _get_db(self):
         """Get database connection."""
@@ -95,8 +108,8 @@ class BookingTool:
         doctors = db.get_doctors_by_specialty(specialty)
         if not doctors:
             # Try case-insensitive match
-            all_doctors = db.get_all_doctors()
-            doctors = [d for d in all_doctors if d["specialty"].lower() == specialty.lower()]
+            self._load_roster()
+            doctors = self._specialty_pool.get(specialty.casefold(), [])
 
         if not doctors:
             return BookingResult(
@@ -107,23 +120,16 @@ class BookingTool:
                 error=f"Specialty '{specialty}' not available"
             )
 
-        # Find available slot
-        available_slots = []
-        for doctor in doctors:
-            slots = db.get_available_slots(doctor["doctor_id"])
-            if slots:
-                # Filter by preferred date if specified
-                if preferred_date:
-                    slots = [s for s in slots if s["slot_datetime"].startswith(preferred_date)]
-                available_slots.extend(slots)
-
-        if not available_slots:
+        # Find the earliest available slot, on the preferred date if possible.
+        # Slots are looked up by the doctors matched above, so the specialty
+        # is only ever case-folded in one place.
+        doctor_ids = [d["doctor_id"] for d in doctors]
+        selected_slot = db.get_earliest_available_slot(doctor_ids, preferred_date)
+        if selected_slot is None and preferred_date:
             # Try to find any available slot in the future
-            for doctor in doctors:
-                slots = db.get_available_slots(doctor["doctor_id"])
-                available_slots.extend(slots)
+            selected_slot = db.get_earliest_available_slot(doctor_ids)
 
-        if not available_slots:
+        if selected_slot is None:
             return BookingResult(
                 success=False,
                 patient_id=patient_id,
@@ -132,10 +138,6 @@ class BookingTool:
                 error="No available appointment slots"
             )
 
-        # Sort by datetime and pick the earliest
-        available_slots.sort(key=lambda s: s["slot_datetime"])
-        selected_slot = available_slots[0]
-
         # Create the appointment
         try:
             appointment_id = db.create_appointment(
@@ -198,9 +200,10 @@ class BookingTool:
             )
 
         # Build reason from gap
-        reason = f"Care gap follow-up: {gap_type}"
         if gap_description:
-            reason = f"{reason} - {gap_description}"
+            reason = f"Care gap follow-up: {gap_type} - {gap_description}"
+        else:
+            reason = f"Care gap follow-up: {gap_type}"
 
         return self.book_appointment(patient_id, specialty, reason)
 
@@ -220,42 +223,78 @@ class BookingTool:
         """Get list of available specialties.
 
         Returns:
-            List of specialty names
+            List of specialty names (cached for SPECIALTIES_TTL_SECONDS)
         """
-        db = self._get_db()
-        doctors = db.get_all_doctors()
-        specialties = list(set(d["specialty"] for d in doctors))
-        return sorted(specialties)
+        self._load_roster()
+        return list(self._specialties)
+
+    def _load_roster(self) -> None:
+        """Refresh the cached specialty list and pool if they have expired."""
+        now = time.monotonic()
+        if self._specialties is None or now >= self._specialties_expires_at:
+            db = self._get_db()
+            pool: dict[str, list[dict]] = {}
+            specialties = set()
+            for doctor in db.get_all_doctors():
+                specialties.add(doctor["specialty"])
+                pool.setdefault(doctor["specialty"].casefold(), []).append(doctor)
+            self._specialties = tuple(sorted(specialties))
+            self._specialty_pool = pool
+            self._specialties_expires_at = now + self.SPECIALTIES_TTL_SECONDS
+
+    def clear_cache(self) -> None:
+        """Drop the cached doctor roster, e.g. after doctors are added or removed."""
+        self._specialties = None
+        self._specialty_pool = {}
 
 
 class VectorSearchTool:
-    """Tool for searching FAISS vector indexes."""
+    """Tool for searching FAISS vector indexes.
+
+    Loaded indexes are cached on the class, so every instance shares them
+    and each index's load is attempted at most once per process - a missing
+    index stays empty rather than hitting the disk again on every search.
+    """
+
+    _patient_index = None
+    _guidelines_index = None
+    _patient_loaded = False
+    _guidelines_loaded = False
+
+    @staticmethod
+    def _load(index, name: str):
+        """Load an index from disk, leaving it empty if that fails.
 
-    def __init__(self):
-        """Initialize vector search tool."""
-        self._patient_index = None
-        self._guidelines_index = None
+        Args:
+            index: FAISSIndex to load
+            name: Index name for the log message
+
+        Returns:
+            The same index, loaded if its files were readable
+        """
+        try:
+            index.load()
+        except OSError:
+            # Missing or unreadable files: searches just return no results
+            pass
+        except Exception as e:
+            print(f"Failed to load {name} index: {e}")
+        return index
 
     def _get_patient_index(self):
         """Get patient notes index."""
-        if self._patient_index is None:
+        if not VectorSearchTool._patient_loaded:
             from vector_store_faiss import get_patient_index
-            self._patient_index = get_patient_index()
-            try:
-                self._patient_index.load()
-            except:
-                pass
+            VectorSearchTool._patient_index = self._load(get_patient_index(), "patient")
+            VectorSearchTool._patient_loaded = True
         return self._patient_index
 
     def _get_guidelines_index(self):
         """Get guidelines index."""
-        if self._guidelines_index is None:
+        if not VectorSearchTool._guidelines_loaded:
             from vector_store_faiss import get_guidelines_index
-            self._guidelines_index = get_guidelines_index()
-            try:
-                self._guidelines_index.load()
-            except:
-                pass
+            VectorSearchTool._guidelines_index = self._load(get_guidelines_index(), "guidelines")
+            VectorSearchTool._guidelines_loaded = True
         return self._guidelines_index
 
     def search_patients(self, query: str, top_k: int = 3) -> list[dict]:
@@ -308,8 +347,8 @@ class ClinicalUtilities:
         Returns:
             Age in years
         """
-        dob = datetime.strptime(birth_date, "%Y-%m-%d")
-        today = datetime.now()
+        dob = date.fromisoformat(birth_date)
+        today = date.today()
         age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
         return age
 
@@ -364,17 +403,49 @@ class ClinicalUtilities:
         """
         return a1c >= goal
 
+    @staticmethod
+    def is_bp_elevated_batch(systolic, diastolic) -> np.ndarray:
+        """Check a cohort of blood pressure readings in one vectorized pass.
+
+        Args:
+            systolic: Array-like of systolic pressures
+            diastolic: Array-like of diastolic pressures (same length)
+
+        Returns:
+            Boolean array, True where the reading is elevated
+        """
+        return (np.asarray(systolic) >= 140) | (np.asarray(diastolic) >= 90)
+
+    @staticmethod
+    def is_a1c_above_goal_batch(a1c, goal: float = 7.0) -> np.ndarray:
+        """Check a cohort of A1C values against goal in one vectorized pass.
+
+        Args:
+            a1c: Array-like of A1C values
+            goal: Target A1C (default 7.0%)
 
-# ICD-10 code lookup (simplified)
-ICD10_CODES = {
-    "E11": {"description": "Type 2 diabetes mellitus", "category": "Endocrine"},
-    "E11.9": {"description": "Type 2 diabetes mellitus without complications", "category": "Endocrine"},
-    "E11.65": {"description": "Type 2 diabetes mellitus with hyperglycemia", "category": "Endocrine"},
-    "I10": {"description": "Essential (primary) hypertension", "category": "Cardiovascular"},
-    "I11": {"description": "Hypertensive heart disease", "category": "Cardiovascular"},
-    "N18": {"description": "Chronic kidney disease", "category": "Renal"},
-    "N18.3": {"description": "Chronic kidney disease, stage 3", "category": "Renal"},
-}
+        Returns:
+            Boolean array, True where the value is above goal
+        """
+        return np.asarray(a1c) >= goal
+
+
+# ICD-10 code lookup (simplified); read-only, entries included, so the
+# shared table cannot be changed through a lookup result
+ICD10_CODES: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "E11": MappingProxyType({"description": "Type 2 diabetes mellitus", "category": "Endocrine"}),
+    "E11.9": MappingProxyType({"description": "Type 2 diabetes mellitus without complications", "category": "Endocrine"}),
+    "E11.65": MappingProxyType({"description": "Type 2 diabetes mellitus with hyperglycemia", "category": "Endocrine"}),
+    "I10": MappingProxyType({"description": "Essential (primary) hypertension", "category": "Cardiovascular"}),
+    "I11": MappingProxyType({"description": "Hypertensive heart disease", "category": "Cardiovascular"}),
+    "N18": MappingProxyType({"description": "Chronic kidney disease", "category": "Renal"}),
+    "N18.3": MappingProxyType({"description": "Chronic kidney disease, stage 3", "category": "Renal"}),
+})
+
+# Entry for codes not in ICD10_CODES
+_UNKNOWN_ICD_CODE: Mapping[str, str] = MappingProxyType(
+    {"description": "Unknown code", "category": "Unknown"}
+)
 
 
 def lookup_icd_code(code: str) -> dict:
@@ -384,9 +455,21 @@ def lookup_icd_code(code: str) -> dict:
         code: ICD-10 code
 
     Returns:
-        dict with code description
+        Dict with code description and category (a fresh copy per call)
     """
-    return ICD10_CODES.get(code, {"description": "Unknown code", "category": "Unknown"})
+    return dict(ICD10_CODES.get(code, _UNKNOWN_ICD_CODE))
+
+
+# Module-level vector search tool instance
+_vector_search_tool: Optional[VectorSearchTool] = None
+
+
+def get_vector_search_tool() -> VectorSearchTool:
+    """Get or create the shared VectorSearchTool instance."""
+    global _vector_search_tool
+    if _vector_search_tool is None:
+        _vector_search_tool = VectorSearchTool()
+    return _vector_search_tool
 
 
 # Convenience functions
@@ -401,7 +484,7 @@ def search_vector_store(query: str, index_name: str, top_k: int = 5) -> list:
     Returns:
         list of search results
     """
-    tool = VectorSearchTool()
+    tool = get_vector_search_tool()
     if index_name == "patients":
         return tool.search_patients(query, top_k)
     elif index_name == "guidelines":
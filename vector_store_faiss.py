@@ -1,7 +1,13 @@
 """FAISS vector store for CareFlow semantic search."""
 
 import json
+import math
 import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Optional
 import numpy as np
@@ -11,11 +17,97 @@ try:
 except ImportError:
     faiss = None
 
-from openai import OpenAI
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from openai import OpenAI, RateLimitError
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Below this many documents an exact flat scan is cheap enough that an
+# approximate index's build cost and recall loss aren't worth paying.
+ANN_MIN_DOCUMENTS = 1000
+
+# HNSW graph parameters: neighbors per node and build-time search depth
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+
+# Batch embedding: texts per request, concurrent requests, and 429 retries
+EMBEDDING_BATCH_SIZE = 256
+EMBEDDING_MAX_WORKERS = 8
+EMBEDDING_MAX_RETRIES = 5
+
+
+_shared_client: Optional[OpenAI] = None
+_shared_client_lock = threading.Lock()
+
+
+def _get_shared_client() -> Optional[OpenAI]:
+    """Get or create the OpenAI client shared by every FAISSIndex.
+
+    One client means one connection pool, so the patient and guideline
+    indexes reuse the same keep-alive connections. Created lazily, so
+    importing this module without an API key still works.
+
+    Returns:
+        OpenAI client, or None if no API key is configured
+    """
+    global _shared_client
+    if _shared_client is not None:
+        return _shared_client
+
+    with _shared_client_lock:
+        if _shared_client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                # Try Streamlit secrets
+                try:
+                    import streamlit as st
+                    if hasattr(st, "secrets") and "OPENAI_API_KEY" in st.secrets:
+                        api_key = st.secrets["OPENAI_API_KEY"]
+                except (ImportError, OSError):
+                    # Streamlit not installed, or no secrets.toml configured
+                    pass
+
+            if api_key:
+                _shared_client = OpenAI(api_key=api_key)
+
+    return _shared_client
+
+
+def _write_atomically(path: Path, write) -> None:
+    """Write a file via a temp file in the same directory, then rename it over path.
+
+    Readers that already opened (or memory-mapped) the old file keep its
+    inode and never see a truncated or half-written file.
+
+    Args:
+        path: Destination file
+        write: Callable that writes the new contents to the Path it is given
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+@lru_cache(maxsize=1024)
+def _cached_embedding(client: OpenAI, model: str, text: str) -> np.ndarray:
+    """Embed text once per (client, model, text); repeat queries skip the API.
+
+    The cached array is shared and read-only - callers must copy it.
+    """
+    response = client.embeddings.create(model=model, input=text)
+    embedding = np.array(response.data[0].embedding, dtype=np.float32)
+    embedding.setflags(write=False)
+    return embedding
+
 
 class FAISSIndex:
     """FAISS-based vector index for semantic search."""
@@ -23,32 +115,32 @@ class FAISSIndex:
     def __init__(
         self,
         index_path: str,
-        embedding_model: str = "text-embedding-3-small"
+        embedding_model: str = "text-embedding-3-small",
+        index_type: str = "auto",
+        nprobe: int = 10
     ):
         """Initialize the FAISS index.
 
         Args:
             index_path: Directory path to store/load index files
             embedding_model: OpenAI embedding model to use
+            index_type: "flat" (exact), "sq8" (flat over int8-quantized
+                vectors), "hnsw" or "ivf" (approximate), or "auto" to pick
+                hnsw once there are ANN_MIN_DOCUMENTS
+            nprobe: IVF clusters scanned per query (recall vs. speed)
         """
         self.index_path = Path(index_path)
         self.embedding_model = embedding_model
-        self.index: Optional[faiss.IndexFlatIP] = None
+        self.index_type = index_type
+        self.nprobe = nprobe
+        self.nlist: Optional[int] = None
+        self.quantizer: Optional[str] = None  # scalar quantizer, e.g. "QT_8bit"
+        self.index: Optional["faiss.Index"] = None
         self.documents: List[Dict] = []
         self.dimension: int = 1536  # text-embedding-3-small dimension
 
-        # Initialize OpenAI client
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            # Try Streamlit secrets
-            try:
-                import streamlit as st
-                if hasattr(st, "secrets") and "OPENAI_API_KEY" in st.secrets:
-                    api_key = st.secrets["OPENAI_API_KEY"]
-            except:
-                pass
-
-        self.client = OpenAI(api_key=api_key) if api_key else None
+        # Shared OpenAI client (None when no API key is configured)
+        self.client = _get_shared_client()
 
     def _get_embedding(self, text: str) -> np.ndarray:
         """Get embedding for a text string.
@@ -62,11 +154,8 @@ class FAISSIndex:
         if not self.client:
             raise ValueError("OpenAI API key not configured")
 
-        response = self.client.embeddings.create(
-            model=self.embedding_model,
-            input=text
-        )
-        return np.array(response.data[0].embedding, dtype=np.float32)
+        # Copy: the cached array is shared and gets normalized in place
+        return _cached_embedding(self.client, self.embedding_model, text).copy()
 
     def _get_embeddings_batch(self, texts: List[str]) -> np.ndarray:
         """Get embeddings for multiple texts.
@@ -80,13 +169,47 @@ class FAISSIndex:
         if not self.client:
             raise ValueError("OpenAI API key not configured")
 
-        response = self.client.embeddings.create(
-            model=self.embedding_model,
-            input=texts
-        )
+        # Stay under the per-request input limit; send chunks concurrently
+        chunks = [
+            texts[i:i + EMBEDDING_BATCH_SIZE]
+            for i in range(0, len(texts), EMBEDDING_BATCH_SIZE)
+        ]
+        if len(chunks) == 1:
+            return self._embed_chunk(chunks[0])
+
+        workers = min(EMBEDDING_MAX_WORKERS, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() yields in submission order, so rows stay aligned with texts
+            return np.vstack(list(executor.map(self._embed_chunk, chunks)))
+
+    def _embed_chunk(self, texts: List[str]) -> np.ndarray:
+        """Embed one request's worth of texts, backing off on rate limits.
+
+        Args:
+            texts: At most EMBEDDING_BATCH_SIZE texts
 
-        embeddings = [data.embedding for data in response.data]
-        return np.array(embeddings, dtype=np.float32)
+        Returns:
+            Numpy array of embeddings (n_texts x dimension)
+        """
+        for attempt in range(EMBEDDING_MAX_RETRIES):
+            try:
+                response = self.client.embeddings.create(
+                    model=self.embedding_model,
+                    input=texts
+                )
+                break
+            except RateLimitError:
+                if attempt == EMBEDDING_MAX_RETRIES - 1:
+                    raise
+                time.sleep(2 ** attempt)
+
+        # Fill a preallocated C-contiguous float32 block row by row, rather
+        # than converting a list of lists
+        data = response.data
+        embeddings = np.empty((len(data), len(data[0].embedding)), dtype=np.float32)
+        for i, item in enumerate(data):
+            embeddings[i] = item.embedding
+        return embeddings
 
     def build_index(self, documents: List[Dict]) -> None:
         """Build FAISS index from documents.
@@ -105,17 +228,70 @@ class FAISSIndex:
         # Get embeddings for all documents
         texts = [doc["text"] for doc in documents]
         embeddings = self._get_embeddings_batch(texts)
+        # FAISS reads float32 rows in place only from a C-contiguous buffer
+        # (no-op for arrays from _get_embeddings_batch)
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
 
         # Normalize embeddings for cosine similarity (using inner product)
         faiss.normalize_L2(embeddings)
 
         # Create index
         self.dimension = embeddings.shape[1]
-        self.index = faiss.IndexFlatIP(self.dimension)  # Inner product = cosine sim after normalization
+        self.index = self._create_index(embeddings)
         self.index.add(embeddings)
 
         print(f"Built index with {len(documents)} documents")
 
+    def _create_index(self, embeddings: np.ndarray) -> "faiss.Index":
+        """Create (and train, if needed) an empty index for the embeddings.
+
+        Args:
+            embeddings: Normalized document embeddings (n_docs x dimension)
+
+        Returns:
+            FAISS index using inner product (cosine sim after normalization)
+        """
+        index_type = self.index_type
+        if index_type == "auto":
+            index_type = "hnsw" if len(embeddings) >= ANN_MIN_DOCUMENTS else "flat"
+
+        self.nlist = None
+        self.quantizer = None
+
+        if index_type == "flat":
+            return faiss.IndexFlatIP(self.dimension)
+
+        if index_type == "sq8":
+            # One byte per dimension instead of four: 4x less memory to scan
+            self.quantizer = "QT_8bit"
+            index = faiss.IndexScalarQuantizer(
+                self.dimension, faiss.ScalarQuantizer.QT_8bit,
+                faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(embeddings)
+            return index
+
+        if index_type == "hnsw":
+            # Graph search visits O(log N) nodes instead of every vector
+            index = faiss.IndexHNSWFlat(
+                self.dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT
+            )
+            index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            return index
+
+        if index_type == "ivf":
+            # Each query scans nprobe of nlist clusters instead of every vector
+            # k-means can't train more clusters than there are vectors
+            self.nlist = min(len(embeddings), max(16, int(4 * math.sqrt(len(embeddings)))))
+            coarse_quantizer = faiss.IndexFlatIP(self.dimension)
+            index = faiss.IndexIVFFlat(
+                coarse_quantizer, self.dimension, self.nlist, faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(embeddings)
+            return index
+
+        raise ValueError(f"Unknown index_type: {self.index_type}")
+
     def query(self, query_text: str, top_k: int = 3) -> List[Dict]:
         """Query the index for similar documents.
 
@@ -129,27 +305,94 @@ class FAISSIndex:
         if self.index is None:
             raise ValueError("Index not built. Call build_index() first.")
 
-        # Get query embedding
+        return self.query_embedding(self.embed_query(query_text), top_k=top_k)
+
+    def embed_query(self, query_text: str) -> np.ndarray:
+        """Embed a query string for use with query_embedding().
+
+        Args:
+            query_text: Query string
+
+        Returns:
+            L2-normalized embedding of shape (1, dimension)
+        """
         query_embedding = self._get_embedding(query_text)
         query_embedding = query_embedding.reshape(1, -1)
         faiss.normalize_L2(query_embedding)
+        return query_embedding
+
+    def query_embedding(self, query_embedding: np.ndarray, top_k: int = 3) -> List[Dict]:
+        """Query the index with a precomputed query embedding.
 
-        # Search
-        scores, indices = self.index.search(query_embedding, top_k)
+        Lets callers embed a query once and search it with several top_k
+        values without repeating the embedding API call.
 
-        # Build results
-        results = []
-        for i, (score, idx) in enumerate(zip(scores[0], indices[0])):
-            if idx < len(self.documents):
-                doc = self.documents[idx]
-                results.append({
-                    "id": doc.get("id", str(idx)),
-                    "text": doc["text"],
-                    "metadata": doc.get("metadata", {}),
-                    "score": float(score)
-                })
+        Args:
+            query_embedding: Normalized embedding from embed_query()
+            top_k: Number of results to return
 
-        return results
+        Returns:
+            List of dicts with "id", "text", "metadata", "score"
+        """
+        if self.index is None:
+            raise ValueError("Index not built. Call build_index() first.")
+
+        return self._search(query_embedding, top_k)[0]
+
+    def query_many(self, queries: List[str], top_k: int = 3) -> List[List[Dict]]:
+        """Query the index with several query strings at once.
+
+        All queries are embedded in a single API call and searched as one
+        matrix, instead of one round-trip and one search per query.
+
+        Args:
+            queries: Query strings
+            top_k: Number of results to return per query
+
+        Returns:
+            One result list per query, in the same order as queries
+        """
+        if self.index is None:
+            raise ValueError("Index not built. Call build_index() first.")
+        if not queries:
+            return []
+
+        query_embeddings = self._get_embeddings_batch(list(queries))
+        faiss.normalize_L2(query_embeddings)
+        return self._search(query_embeddings, top_k)
+
+    def _search(self, query_embeddings: np.ndarray, top_k: int) -> List[List[Dict]]:
+        """Search normalized query embeddings (n_queries x dimension).
+
+        Returns:
+            One result list per query row
+        """
+        # Search knobs go in per-call params, not on the index: the index is
+        # shared across threads, and concurrent searches may use other top_k
+        params = None
+        if isinstance(self.index, faiss.IndexIVF):
+            params = faiss.SearchParametersIVF(nprobe=self.nprobe)
+        elif isinstance(self.index, faiss.IndexHNSW):
+            params = faiss.SearchParametersHNSW(efSearch=max(top_k * 4, 32))
+
+        scores, indices = self.index.search(query_embeddings, top_k, params=params)
+
+        # Build results (FAISS pads missing hits with index -1)
+        all_results = []
+        for row_scores, row_indices in zip(scores, indices):
+            results = []
+            for score, idx in zip(row_scores, row_indices):
+                if 0 <= idx < len(self.documents):
+                    doc = self.documents[idx]
+                    results.append({
+                        "id": doc.get("id", str(idx)),
+                        "text": doc["text"],
+                        "metadata": doc.get("metadata", {}),
+                        "score": float(score)
+                    })
+            all_results.append(results)
+
+        return all_results
 
     def save(self) -> None:
         """Save index and documents to disk."""
@@ -158,14 +401,18 @@ class FAISSIndex:
 
         self.index_path.mkdir(parents=True, exist_ok=True)
 
-        # Save FAISS index
+        # Save FAISS index. load() memory-maps this file, so never rewrite it
+        # in place: a process still mapping it would fault (SIGBUS) on query.
         index_file = self.index_path / "index.faiss"
-        faiss.write_index(self.index, str(index_file))
+        _write_atomically(index_file, lambda tmp: faiss.write_index(self.index, str(tmp)))
 
         # Save documents
         docs_file = self.index_path / "documents.json"
-        with open(docs_file, "w") as f:
-            json.dump(self.documents, f, indent=2)
+        if orjson is not None:
+            documents = orjson.dumps(self.documents)
+        else:
+            documents = json.dumps(self.documents).encode()
+        _write_atomically(docs_file, lambda tmp: tmp.write_bytes(documents))
 
         # Save metadata
         meta_file = self.index_path / "metadata.json"
@@ -173,7 +420,10 @@ class FAISSIndex:
             json.dump({
                 "embedding_model": self.embedding_model,
                 "dimension": self.dimension,
-                "num_documents": len(self.documents)
+                "num_documents": len(self.documents),
+                "nlist": self.nlist,
+                "nprobe": self.nprobe,
+                "quantizer": self.quantizer
             }, f, indent=2)
 
         print(f"Saved index to {self.index_path}")
@@ -191,23 +441,48 @@ class FAISSIndex:
         if not all(f.exists() for f in [index_file, docs_file, meta_file]):
             return False
 
-        # Load FAISS index
-        self.index = faiss.read_index(str(index_file))
+        # Memory-map the FAISS index: pages fault in on demand instead of the
+        # whole index being copied into RAM. IO_FLAG_MMAP_IFC (flat codes,
+        # e.g. IndexFlatIP) only exists in newer FAISS releases.
+        mmap_flags = (
+            faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+            | getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+        )
+        try:
+            self.index = faiss.read_index(str(index_file), mmap_flags)
+        except RuntimeError:
+            # Not every index type can be mapped (e.g. IVF lists with IFC)
+            self.index = faiss.read_index(str(index_file))
 
         # Load documents
-        with open(docs_file, "r") as f:
-            self.documents = json.load(f)
+        if orjson is not None:
+            self.documents = orjson.loads(docs_file.read_bytes())
+        else:
+            with open(docs_file, "r") as f:
+                self.documents = json.load(f)
 
         # Load metadata
         with open(meta_file, "r") as f:
             meta = json.load(f)
             self.embedding_model = meta.get("embedding_model", self.embedding_model)
             self.dimension = meta.get("dimension", self.dimension)
+            self.nlist = meta.get("nlist", self.nlist)
+            self.nprobe = meta.get("nprobe", self.nprobe)
+            self.quantizer = meta.get("quantizer", self.quantizer)
 
         print(f"Loaded index with {len(self.documents)} documents")
         return True
 
 
+# Guideline markdown headers: the "# " title plus "## Field:" metadata lines
+HEADER_RE = re.compile(r"(# |## Category:|## Condition:|## Source:)(.*)")
+_HEADER_METADATA_KEYS = {
+    "## Category:": "category",
+    "## Condition:": "condition",
+    "## Source:": "source",
+}
+
+
 def load_guidelines_from_markdown(kb_dir: str = "data/medical_kb") -> List[Dict]:
     """Load guideline documents from markdown files.
 
@@ -225,30 +500,29 @@ def load_guidelines_from_markdown(kb_dir: str = "data/medical_kb") -> List[Dict]
         return documents
 
     for md_file in sorted(kb_path.glob("*.md")):
-        content = md_file.read_text(encoding="utf-8")
-
         # Parse metadata from front matter if present
         metadata = {"source_file": md_file.name}
 
         # Extract guideline ID from filename
         guideline_id = md_file.stem  # e.g., "guideline_001_a1c_threshold"
 
-        # Parse content for title and body
-        lines = content.strip().split("\n")
+        # Parse content for title and body, streaming lines from the file
+        # rather than holding the whole file and a split copy of it
         title = ""
         body_lines = []
 
-        for line in lines:
-            if line.startswith("# ") and not title:
-                title = line[2:].strip()
-            elif line.startswith("## Category:"):
-                metadata["category"] = line.replace("## Category:", "").strip()
-            elif line.startswith("## Condition:"):
-                metadata["condition"] = line.replace("## Condition:", "").strip()
-            elif line.startswith("## Source:"):
-                metadata["source"] = line.replace("## Source:", "").strip()
-            elif not line.startswith("#"):
-                body_lines.append(line)
+        with md_file.open(encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\r\n")
+                match = HEADER_RE.match(line)
+                if match:
+                    header, value = match.groups()
+                    if header == "# ":
+                        title = title or value.strip()
+                    else:
+                        metadata[_HEADER_METADATA_KEYS[header]] = value.strip()
+                elif not line.startswith("#"):
+                    body_lines.append(line)
 
         # Combine for searchable text
         text = f"{title}\n\n" + "\n".join(body_lines).strip()